@@ -1,13 +1,21 @@
 import argparse
 
 
+class NonExitingArgumentParser(argparse.ArgumentParser):
+    def error(self, message):
+        raise argparse.ArgumentError(None, message)
+
+
 class CliArgumentParser:
     def __init__(self):
-        self.parser = argparse.ArgumentParser(exit_on_error=False)
+        self.parser = NonExitingArgumentParser(exit_on_error=False)
+        self.positional_names = []
         self.positional_args = []
         self.flag_args = []
+        self.switch_args = []
 
     def add_positional_argument(self, *args, **kwargs):
+        self.positional_names.append(args[0])
         if 'choices' in kwargs:
             self.positional_args.extend(kwargs['choices'])
         self.parser.add_argument(*args, **kwargs)
@@ -16,5 +24,10 @@ class CliArgumentParser:
         self.flag_args.extend(args)
         self.parser.add_argument(*args, **kwargs)
 
+    def add_switch_argument(self, *args, **kwargs):
+        self.flag_args.extend(args)
+        self.switch_args.extend(args)
+        self.parser.add_argument(*args, action='store_true', **kwargs)
+
     def parse_args(self, args):
         return self.parser.parse_args(args)
@@ -1,7 +1,11 @@
+import re
+
 from prompt_toolkit.completion import Completer, Completion, WordCompleter
 from prompt_toolkit.document import Document
+from .input_processing import PIPELINE_SEPARATOR
 
 exit_program = "exit"
+COMMAND_PATTERN = re.compile(r"[^ ]*")
 
 
 class ContextSensitiveCompleter(Completer):
@@ -10,16 +14,24 @@ class ContextSensitiveCompleter(Completer):
         self.command_completers = {cmd.command_name: cmd for cmd in commands}
 
     def get_completions(self, document: Document, complete_event):
+        document = self.get_segment_document(document)
         text = document.text_before_cursor
-        words = text.split(" ")
-        if not words or (len(words) == 1 and not text.endswith(" ")):
+        command_name = COMMAND_PATTERN.match(text).group()
+        if len(command_name) == len(text):
             for completion in self.first_word_completer.get_completions(document, complete_event):
-                yield Completion(completion.text if completion.text == exit_program else completion.text + '', start_position=completion.start_position)
+                yield Completion(completion.text, start_position=completion.start_position)
         else:
-            command_name = words[0]
             command = self.command_completers.get(command_name)
             if not command:
                 yield Completion("", start_position=-len(document.get_word_before_cursor()))
             else:
                 for completion in command.get_completions(document, complete_event):
                     yield completion
+
+    def get_segment_document(self, document: Document) -> Document:
+        text = document.text_before_cursor
+        separator = text.rfind(PIPELINE_SEPARATOR)
+        if separator < 0:
+            return document
+
+        return Document(text[separator + 1:].lstrip())
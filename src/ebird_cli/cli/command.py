@@ -1,15 +1,22 @@
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date
 from typing import Generator, List, Dict
 
 from colorama import Fore
 from .argument_parser import CliArgumentParser
-from .command_argument import CommandArgument, RegionScopeArgument, BackArgument, ArgumentNames
+from .command_argument import CommandArgument, RegionScopeArgument, BackArgument, ArgumentNames, SweepScopeArgument, ParallelArgument, TopArgument, \
+    DetailsArgument, ChecklistIdArgument, DateArgument, LimitArgument, TargetsArgument, ResultArgument, ResultSearchArgument, SortArgument
 from .input_processing import preprocess_input, FLAG
+from .tokenizer import IncrementalTokenizer, TokenizedInput, TokenKind
+from ..domain import ObservationBatch
+from ..domain.observation_batch import BatchColumns
 from ..domain.regional_scopes import RegionalScopes
+from ..domain.target_lists import TargetLists
 from ..services.location import LocationService
 from ..services.observation import ObservationService
 from ..services.printing import PrintingService
 from ..utils.logger import logger
-import argparse
 from prompt_toolkit.completion import Completer, Completion, WordCompleter
 from prompt_toolkit.document import Document
 
@@ -24,6 +31,7 @@ class Command(Completer):
         self.parser = CliArgumentParser()
         self.flag_completer = None
         self.positional_completer = None
+        self.tokenizer = None
         self.arguments: List[CommandArgument] = []
         self.mandatory_params = []
         self.optional_params = []
@@ -31,11 +39,21 @@ class Command(Completer):
         self.setup_arguments()
 
     def process_command(self, **kwargs):
+        self.render_result(self.fetch_result(**kwargs))
+
+    def fetch_result(self, **kwargs):
+        raise NotImplementedError
+
+    def render_result(self, result):
         raise NotImplementedError
 
     def register_arguments(self):
         raise NotImplementedError
 
+    def record_result(self, observations):
+        if isinstance(observations, ObservationBatch):
+            self.observation_service.record_result(self.command_name, observations)
+
     def arg_is_multi_word(self, arg_name):
         for argument in self.arguments:
             if argument.arg_is_multi_word(arg_name):
@@ -43,22 +61,20 @@ class Command(Completer):
         return False
 
     def handle_command(self, *args):
-        processed_input = preprocess_input(' '.join(args).split())
+        self.process_command(**self.parse_command(*args))
+
+    def parse_command(self, *args) -> Dict[str, any]:
+        processed_input = preprocess_input(' '.join(args).split(), self.parser.switch_args)
         logger.debug(f"user input: {processed_input}")
-        user_input = self.parser.parse_args(processed_input)
+        return self.get_keywords(self.parser.parse_args(processed_input))
 
+    def get_keywords(self, user_input) -> Dict[str, any]:
         kwargs: Dict[str, any] = dict()
 
         for argument in self.arguments:
             kwargs.update(argument.get_keywords(user_input))
 
-        self.process_command(**kwargs)
-
-    def find_last_flag(self, words):
-        for word in reversed(words):
-            if word.startswith(FLAG):
-                return word
-        return None
+        return kwargs
 
     def setup_arguments(self):
         self.register_arguments()
@@ -70,63 +86,35 @@ class Command(Completer):
 
         self.positional_completer = WordCompleter(self.parser.positional_args, ignore_case=True)
         self.flag_completer = WordCompleter(self.parser.flag_args, ignore_case=True, match_middle=True)
+        self.tokenizer = IncrementalTokenizer(self.parser)
 
     def get_completions(self, document: Document, complete_event):
-        text = document.text_before_cursor
-        words = text.split(" ")[1:]
-        logger.debug(f"command get_completions: {words}")
-
-        try:
-            if len(words) <= len([param for param in self.mandatory_params if not param.startswith(FLAG)]):
-                for completion in self.positional_completer.get_completions(document, complete_event):
-                    yield Completion(completion.text, start_position=-len(document.get_word_before_cursor()))
-            elif (words[-1] == "" and not words[-2].startswith(FLAG) and not self.arg_is_multi_word(self.find_last_flag(words))) or words[-1].startswith(FLAG):
-                yield from self.get_flag_arg_completions(document, complete_event, words)
-            else:
-                yield from self.get_flag_value_completions(words, document)
-        except argparse.ArgumentError as e:
-            raise e.with_traceback(None)
-
-    def get_flag_arg_completions(self, document, complete_event, words) -> Generator:
-        flag_count = len([s for s in words if s.startswith(FLAG)])
-
-        for completion in [completion for completion in self.flag_completer.get_completions(document, complete_event) if
-                           completion.text not in words and (completion.text in self.mandatory_params or flag_count >= len(self.mandatory_params))]:
-            if words[-1] == "":
-                start_position = -len(document.get_word_before_cursor())
-            else:
-                text_before_cursor = document.text_before_cursor
-                hyphen_index = text_before_cursor.rfind(FLAG)
-                start_position = hyphen_index - len(text_before_cursor)
-            yield Completion(completion.text, start_position=start_position)
-
-    def get_flag_value_completions(self, words, document: Document) -> Generator:
-        user_input = self.parser.parse_args(preprocess_input(words))
-
-        text_before_cursor = document.text_before_cursor
-        words = text_before_cursor.strip().split()
-        if not words:
-            return
+        tokens = self.tokenizer.update(document.text_before_cursor)
+        logger.debug(f"command get_completions: {tokens.current_word}")
+
+        if tokens.completed_args < len(self.parser.positional_names):
+            for completion in self.positional_completer.get_completions(document, complete_event):
+                yield Completion(completion.text, start_position=-len(document.get_word_before_cursor()))
+        elif tokens.current_word.startswith(FLAG) or (tokens.current_word == "" and (tokens.previous is None or tokens.previous.kind != TokenKind.FLAG)
+                                                       and not self.arg_is_multi_word(tokens.last_flag)):
+            yield from self.get_flag_arg_completions(document, complete_event, tokens)
+        else:
+            yield from self.get_flag_value_completions(tokens)
 
-        known_flags = set(self.parser.flag_args)
+    def get_flag_arg_completions(self, document, complete_event, tokens: TokenizedInput) -> Generator:
+        start_position = tokens.current_start - len(tokens.text)
 
-        last_flag_index = None
-        for i in reversed(range(len(words))):
-            if words[i] in known_flags:
-                last_flag_index = i
-                break
+        for completion in self.flag_completer.get_completions(document, complete_event):
+            if completion.text not in tokens.used_flags and (completion.text in self.mandatory_params or tokens.flag_count >= len(self.mandatory_params)):
+                yield Completion(completion.text, start_position=start_position)
 
-        if last_flag_index is not None and last_flag_index < len(words) - 1:
-            words_after_flag = words[last_flag_index + 1:]
-            start_position = -len(' '.join(words_after_flag))
-        elif last_flag_index is not None:
-            start_position = 0
-        else:
-            start_position = -len(document.get_word_before_cursor())
+    def get_flag_value_completions(self, tokens: TokenizedInput) -> Generator:
+        if tokens.last_flag is None:
+            return
 
         for argument in self.arguments:
-            if argument.supports_flag_argument_completion(words[last_flag_index]):
-                yield from argument.get_flag_values(user_input, start_position)
+            if argument.supports_flag_argument_completion(tokens.last_flag):
+                yield from argument.get_flag_values(tokens.completion_namespace, -len(tokens.current_value))
 
     def print_mandatory_param(self, param_name, param_values):
         print(f"{Fore.MAGENTA}{param_name}{Fore.RESET}: {param_values}")
@@ -154,23 +142,78 @@ class ObservationCommand(Command):
     scope_arg = str(ArgumentNames.SCOPE.value)
     region_arg = str(ArgumentNames.REGION.value)
     back_arg = str(ArgumentNames.BACK.value)
+    top_arg = str(ArgumentNames.TOP.value)
+    limit_arg = str(ArgumentNames.LIMIT.value)
 
-    def process_command(self, **kwargs):
-        logger.debug(f"process_command - kwargs: {kwargs}")
+    def fetch_result(self, **kwargs):
+        logger.debug(f"fetch_result - kwargs: {kwargs}")
 
         region = kwargs[self.region_arg]
         scope = kwargs[self.scope_arg]
         days_back = kwargs[self.back_arg]
+        limit = kwargs[self.limit_arg]
+
+        region_ids = self.get_region_ids(region, scope, kwargs[self.top_arg])
+        if self.is_streamed(**kwargs):
+            return self.stream_observations(region_ids, days_back, limit)
 
-        self.handle_observations(region, scope, days_back)
+        return self.get_observations(region_ids, scope, days_back, limit)
+
+    def is_streamed(self, **kwargs) -> bool:
+        return kwargs[self.scope_arg] == RegionalScopes.NATIONAL.value
 
     def register_arguments(self):
-        self.arguments = [RegionScopeArgument(self.location_service),
-                          BackArgument()]
+        self.region_scope_argument = RegionScopeArgument(self.location_service)
+        self.arguments = [self.region_scope_argument,
+                          BackArgument(),
+                          TopArgument(None),
+                          LimitArgument()]
+
+    def get_region_ids(self, region, scope, top) -> list:
+        if scope == RegionalScopes.NEARBY.value:
+            return []
+
+        if top is not None:
+            hotspot_ids = self.location_service.get_active_hotspot_ids(region, scope, top)
+            if hotspot_ids:
+                return hotspot_ids
+
+        return self.location_service.get_region_ids_by_scope(region, scope)
+
+    def get_observations(self, region_ids, scope, back, limit):
+        raise NotImplementedError
+
+    def stream_observations(self, region_ids, back, limit):
+        raise NotImplementedError
 
-    def handle_observations(self, region, scope, back):
+    def prefetch_observations(self, region_ids, scope, back, limit):
         raise NotImplementedError
 
+    def get_completions(self, document: Document, complete_event):
+        self.prefetch(self.tokenizer.update(document.text_before_cursor))
+        yield from super().get_completions(document, complete_event)
+
+    def prefetch(self, tokens: TokenizedInput):
+        if not tokens.is_valid:
+            return
+
+        try:
+            kwargs = self.get_keywords(tokens.namespace)
+        except (ValueError, argparse.ArgumentError):
+            return
+
+        region = kwargs[self.region_arg]
+        scope = kwargs[self.scope_arg]
+
+        if self.is_streamed(**kwargs):
+            return
+        elif scope == RegionalScopes.NEARBY.value:
+            self.prefetch_observations([], scope, kwargs[self.back_arg], kwargs[self.limit_arg])
+        elif self.region_scope_argument.is_complete_region(scope, region):
+            region_ids = self.get_region_ids(region, scope, kwargs[self.top_arg])
+            if region_ids:
+                self.prefetch_observations(region_ids, scope, kwargs[self.back_arg], kwargs[self.limit_arg])
+
 
 class RecentCommand(ObservationCommand):
     def __init__(self, observation_service: ObservationService, location_service: LocationService, printing_service: PrintingService):
@@ -179,26 +222,271 @@ class RecentCommand(ObservationCommand):
         self.command_name = "recent"
         self.description = "Retrieve recent observations for the specified region"
 
-    def handle_observations(self, region, scope, back):
+    def get_observations(self, region_ids, scope, back, limit):
+        if scope == RegionalScopes.NEARBY.value:
+            return self.observation_service.get_nearby_recent_observations(back, limit)
+        else:
+            return self.observation_service.get_recent_observations(region_ids, back, limit)
+
+    def stream_observations(self, region_ids, back, limit):
+        return self.observation_service.stream_recent_observations(region_ids, back, limit), None
+
+    def prefetch_observations(self, region_ids, scope, back, limit):
         if scope == RegionalScopes.NEARBY.value:
-            observations = self.observation_service.get_nearby_recent_observations(back)
+            self.observation_service.prefetch_nearby_recent_observations(back, limit)
         else:
-            observations = self.observation_service.get_recent_observations(self.location_service.get_region_ids_by_scope(region, scope), back)
+            self.observation_service.prefetch_recent_observations(region_ids, back, limit)
 
+    def render_result(self, result):
+        observations, sightings = result
+        self.record_result(observations)
+        if sightings is not None:
+            self.observation_service.record_sightings(sightings)
         self.printing_service.print_recent(observations)
 
 
 class NotableCommand(ObservationCommand):
+    details_arg = str(ArgumentNames.DETAILS.value)
+
     def __init__(self, observation_service: ObservationService, location_service: LocationService, printing_service: PrintingService):
         super().__init__(observation_service, location_service, printing_service)
 
         self.command_name = "notable"
         self.description = "Retrieve notable observations for the specified region"
 
-    def handle_observations(self, region, scope: str, back):
+    def register_arguments(self):
+        super().register_arguments()
+        self.arguments.append(DetailsArgument())
+
+    def is_streamed(self, **kwargs) -> bool:
+        return super().is_streamed(**kwargs) and not kwargs[self.details_arg]
+
+    def fetch_result(self, **kwargs):
+        observations = super().fetch_result(**kwargs)
+        checklists = self.observation_service.get_checklists(observations.submission_id_values()) if kwargs[self.details_arg] else None
+
+        return observations, checklists
+
+    def get_observations(self, region_ids, scope: str, back, limit):
+        if scope == RegionalScopes.NEARBY.value:
+            return self.observation_service.get_nearby_notable_observations(back, limit)
+        else:
+            return self.observation_service.get_notable_observations(region_ids, back, limit)
+
+    def stream_observations(self, region_ids, back, limit):
+        return self.observation_service.stream_notable_observations(region_ids, back, limit)
+
+    def prefetch_observations(self, region_ids, scope, back, limit):
         if scope == RegionalScopes.NEARBY.value:
-            observations = self.observation_service.get_nearby_notable_observations(back)
+            self.observation_service.prefetch_nearby_notable_observations(back, limit)
+        else:
+            self.observation_service.prefetch_notable_observations(region_ids, back, limit)
+
+    def render_result(self, result):
+        observations, checklists = result
+        self.record_result(observations)
+        if checklists is None:
+            self.printing_service.print_notable(observations)
+        else:
+            self.printing_service.print_notable_details(observations, checklists)
+
+
+class ChecklistCommand(Command):
+    id_arg = str(ArgumentNames.ID.value)
+
+    def __init__(self, observation_service: ObservationService, location_service: LocationService, printing_service: PrintingService):
+        super().__init__(observation_service, location_service, printing_service)
+
+        self.command_name = "checklist"
+        self.description = "Retrieve the checklists with the specified submission ids"
+
+    def register_arguments(self):
+        self.arguments = [ChecklistIdArgument()]
+
+    def fetch_result(self, **kwargs):
+        checklists = self.observation_service.get_checklists(kwargs[self.id_arg])
+
+        return [checklists[sub_id] for sub_id in dict.fromkeys(kwargs[self.id_arg])], self.observation_service.get_species_names()
+
+    def render_result(self, result):
+        checklists, species_names = result
+        for checklist in checklists:
+            self.printing_service.print_checklist(checklist, species_names)
+
+
+class HistoricCommand(Command):
+    scope_arg = str(ArgumentNames.SCOPE.value)
+    region_arg = str(ArgumentNames.REGION.value)
+    from_arg = str(ArgumentNames.FROM.value)
+    to_arg = str(ArgumentNames.TO.value)
+    scopes = [RegionalScopes.HOTSPOT, RegionalScopes.REGIONAL, RegionalScopes.SUBNATIONAL]
+    MAX_DAYS = 366
+
+    def __init__(self, observation_service: ObservationService, location_service: LocationService, printing_service: PrintingService):
+        super().__init__(observation_service, location_service, printing_service)
+
+        self.command_name = "historic"
+        self.description = "Retrieve the observations of a past date range for the specified region"
+
+    def register_arguments(self):
+        self.arguments = [RegionScopeArgument(self.location_service, self.scopes),
+                          DateArgument(self.from_arg, True, "First day, as YYYY-MM-DD"),
+                          DateArgument(self.to_arg, False, "Last day, as YYYY-MM-DD (default: today)")]
+
+    def get_keywords(self, user_input) -> Dict[str, any]:
+        kwargs = super().get_keywords(user_input)
+        start, end = kwargs[self.from_arg], kwargs[self.to_arg]
+
+        if end > date.today():
+            raise argparse.ArgumentError(None, "-to cannot be in the future")
+        if start > end:
+            raise argparse.ArgumentError(None, "-from must not be after -to")
+        if (end - start).days >= self.MAX_DAYS:
+            raise argparse.ArgumentError(None, f"date range cannot exceed {self.MAX_DAYS} days")
+
+        return kwargs
+
+    def fetch_result(self, **kwargs):
+        logger.debug(f"fetch_result - kwargs: {kwargs}")
+
+        region_ids = self.location_service.get_region_ids_by_scope(kwargs[self.region_arg], kwargs[self.scope_arg])
+        return self.observation_service.get_historic_observations(region_ids, kwargs[self.from_arg], kwargs[self.to_arg])
+
+    def render_result(self, result):
+        self.record_result(result)
+        self.printing_service.print_historic(result)
+
+
+class SweepCommand(Command):
+    scope_arg = str(ArgumentNames.SCOPE.value)
+    back_arg = str(ArgumentNames.BACK.value)
+    parallel_arg = str(ArgumentNames.PARALLEL.value)
+    top_arg = str(ArgumentNames.TOP.value)
+
+    def __init__(self, observation_service: ObservationService, location_service: LocationService, printing_service: PrintingService):
+        super().__init__(observation_service, location_service, printing_service)
+
+        self.command_name = "sweep"
+        self.description = "Retrieve notable observations for every subregion, or the top hotspots, of the default region"
+
+    def register_arguments(self):
+        self.arguments = [SweepScopeArgument(),
+                          BackArgument(),
+                          ParallelArgument(),
+                          TopArgument()]
+
+    def fetch_result(self, **kwargs):
+        logger.debug(f"fetch_result - kwargs: {kwargs}")
+
+        if kwargs[self.scope_arg] == RegionalScopes.HOTSPOT.value:
+            regions = self.location_service.get_top_hotspot_ids(kwargs[self.top_arg])
         else:
-            observations = self.observation_service.get_notable_observations(self.location_service.get_region_ids_by_scope(region, scope), back)
+            regions = self.location_service.get_subregion_ids()
+
+        executor = ThreadPoolExecutor(max_workers=kwargs[self.parallel_arg], thread_name_prefix="ebird_cli_sweep")
+        futures = {executor.submit(self.observation_service.get_notable_observations, [region_id], kwargs[self.back_arg]): region_name
+                   for region_name, region_id in regions}
+        executor.shutdown(wait=False)
+
+        return futures
+
+    def render_result(self, result):
+        region_observations = []
+
+        print()
+        for future in as_completed(result):
+            region_name = result[future]
+            try:
+                observations = future.result()
+            except Exception as e:
+                logger.exception(f"sweep of {region_name} failed")
+                self.printing_service.print_sweep_failure(region_name, e)
+                continue
+
+            self.printing_service.print_sweep_progress(region_name, observations)
+            region_observations.append((region_name, observations))
+
+        self.printing_service.print_sweep_summary(region_observations)
+
+
+class TargetsCommand(Command):
+    scope_arg = str(ArgumentNames.SCOPE.value)
+    targets_arg = str(ArgumentNames.TARGETS.value)
+    top_arg = str(ArgumentNames.TOP.value)
+
+    def __init__(self, observation_service: ObservationService, location_service: LocationService, printing_service: PrintingService):
+        super().__init__(observation_service, location_service, printing_service)
+
+        self.command_name = "targets"
+        self.description = "Rank the regions, or the hotspots, of the recent results by life or year targets"
+
+    def register_arguments(self):
+        self.arguments = [SweepScopeArgument("Ranking scope"),
+                          TargetsArgument(TargetLists.LIFE, "Target list to rank by, life or year (default: life)"),
+                          TopArgument(25, 200, "Number of regions to show")]
+
+    def fetch_result(self, **kwargs):
+        logger.debug(f"fetch_result - kwargs: {kwargs}")
+
+        return self.observation_service.rank_targets(self.printing_service.life_list, self.printing_service.year_list, kwargs[self.targets_arg],
+                                                     kwargs[self.scope_arg] == RegionalScopes.REGIONAL.value, kwargs[self.top_arg])
+
+    def render_result(self, result):
+        self.printing_service.print_targets(result)
+
+
+class RefineCommand(Command):
+    result_arg = str(ArgumentNames.RESULT.value)
+    species_arg = str(ArgumentNames.SPECIES.value)
+    subregion_arg = str(ArgumentNames.SUBREGION.value)
+    targets_arg = str(ArgumentNames.TARGETS.value)
+    sort_arg = str(ArgumentNames.SORT.value)
+    source_key = "source"
+    sort_columns = {"location": BatchColumns.location, "species": BatchColumns.name}
+
+    def __init__(self, observation_service: ObservationService, location_service: LocationService, printing_service: PrintingService):
+        super().__init__(observation_service, location_service, printing_service)
+
+        self.command_name = "refine"
+        self.description = "Filter and sort one of the latest results without fetching it again"
+
+    def register_arguments(self):
+        self.arguments = [ResultArgument(),
+                          ResultSearchArgument(self.species_arg, BatchColumns.name, "Species name to search for", self.observation_service),
+                          ResultSearchArgument(self.subregion_arg, BatchColumns.subname, "Subregion name to search for", self.observation_service),
+                          TargetsArgument(None, "Show only life or year targets"),
+                          SortArgument()]
+
+    def get_keywords(self, user_input) -> Dict[str, any]:
+        kwargs = super().get_keywords(user_input)
+
+        source = self.observation_service.get_result(kwargs[self.result_arg])
+        if source is None:
+            raise argparse.ArgumentError(None, f"no result {kwargs[self.result_arg]}, run a recent, notable or historic query first")
+        kwargs[self.source_key] = source
+
+        return kwargs
+
+    def fetch_result(self, **kwargs):
+        logger.debug(f"fetch_result - kwargs: {kwargs}")
+
+        command_name, observations = kwargs[self.source_key]
+        source_count = len(observations)
+
+        if kwargs[self.species_arg]:
+            observations = observations.filter(observations.search_mask(BatchColumns.name, kwargs[self.species_arg]))
+        if kwargs[self.subregion_arg]:
+            observations = observations.filter(observations.search_mask(BatchColumns.subname, kwargs[self.subregion_arg]))
+        if kwargs[self.targets_arg] == TargetLists.LIFE:
+            observations = observations.filter(self.printing_service.get_life_targets(observations))
+        elif kwargs[self.targets_arg] == TargetLists.YEAR:
+            observations = observations.filter(self.printing_service.get_year_targets(observations))
+
+        sort_column = self.sort_columns.get(kwargs[self.sort_arg])
+        observations = observations.sorted_by(sort_column) if sort_column else observations.sorted_by_datetime()
+
+        return command_name, source_count, observations
 
-        self.printing_service.print_notable(observations)
+    def render_result(self, result):
+        command_name, source_count, observations = result
+        self.printing_service.print_refined(command_name, source_count, observations)
@@ -1,17 +1,35 @@
+import argparse
+import re
+from datetime import date, timedelta
 from enum import Enum
 from typing import Generator
 from abc import ABC, abstractmethod
 from prompt_toolkit.completion import Completion
 from .argument_parser import CliArgumentParser
 from .input_processing import flag_arg_name
+from ..domain.observation_batch import BatchColumns
 from ..domain.regional_scopes import RegionalScopes
+from ..domain.target_lists import TargetLists
 from ..services import LocationService
+from ..services.observation import ObservationService
 
 
 class ArgumentNames(Enum):
     SCOPE = "scope"
     REGION = "region"
     BACK = "back"
+    PARALLEL = "parallel"
+    TOP = "top"
+    DETAILS = "details"
+    ID = "id"
+    FROM = "from"
+    TO = "to"
+    LIMIT = "limit"
+    TARGETS = "targets"
+    RESULT = "result"
+    SPECIES = "species"
+    SUBREGION = "subregion"
+    SORT = "sort"
 
 
 class CommandArgument(ABC):
@@ -48,15 +66,16 @@ class RegionScopeArgument(CommandArgument):
     scope_arg = str(ArgumentNames.SCOPE.value)
     region_arg = str(ArgumentNames.REGION.value)
 
-    def __init__(self, location_service: LocationService):
+    def __init__(self, location_service: LocationService, scopes=tuple(RegionalScopes)):
         self.location_service = location_service
+        self.scopes = [scope.value for scope in scopes]
 
     def get_flag_values(self, user_input, start_position) -> Generator:
         for completion in self.get_region_completions(user_input.scope, user_input.region):
             yield Completion(completion, start_position=start_position)
 
     def setup_parser(self, parser: CliArgumentParser):
-        parser.add_positional_argument(self.scope_arg, type=str, choices=[scope.value for scope in RegionalScopes], help='Regional scope')
+        parser.add_positional_argument(self.scope_arg, type=str, choices=self.scopes, help='Regional scope')
         parser.add_flag_argument(flag_arg_name(self.region_arg), type=str, required=False, help='Region code')
 
     def get_mandatory_arguments(self):
@@ -74,6 +93,9 @@ class RegionScopeArgument(CommandArgument):
     def supports_flag_argument_completion(self, arg_name: str):
         return arg_name == flag_arg_name(self.region_arg)
 
+    def is_complete_region(self, scope, region) -> bool:
+        return region is not None and region in self.get_region_completions(scope, region)
+
     def get_region_completions(self, scope, region) -> list:
         if scope == RegionalScopes.SUBNATIONAL.value:
             return self.location_service.get_subnationals() if region == "" else self.location_service.search_subnationals(region)
@@ -81,6 +103,8 @@ class RegionScopeArgument(CommandArgument):
             return self.location_service.get_regions() if region == "" else self.location_service.search_regions(region)
         elif scope == RegionalScopes.HOTSPOT.value:
             return self.location_service.get_hotspots() if region == "" else self.location_service.search_hotspots(region)
+        elif scope == RegionalScopes.NATIONAL.value:
+            return self.location_service.get_nationals() if region == "" else self.location_service.search_nationals(region)
         else:
             return []
 
@@ -110,3 +134,287 @@ class BackArgument(CommandArgument):
 
     def supports_flag_argument_completion(self, arg_name: str):
         return arg_name == flag_arg_name(self.back_arg)
+
+
+class SweepScopeArgument(CommandArgument):
+    scope_arg = str(ArgumentNames.SCOPE.value)
+    scopes = [RegionalScopes.REGIONAL.value, RegionalScopes.HOTSPOT.value]
+
+    def __init__(self, help_text="Sweep scope"):
+        self.help_text = help_text
+
+    def get_flag_values(self, user_input, start_position) -> Generator:
+        yield from []
+
+    def setup_parser(self, parser: CliArgumentParser):
+        parser.add_positional_argument(self.scope_arg, type=str, choices=self.scopes, help=self.help_text)
+
+    def get_mandatory_arguments(self):
+        return [self.scope_arg]
+
+    def get_optional_arguments(self):
+        return []
+
+    def arg_is_multi_word(self, arg_name: str):
+        return False
+
+    def get_keywords(self, user_input):
+        return {self.scope_arg: user_input.scope}
+
+    def supports_flag_argument_completion(self, arg_name: str):
+        return False
+
+
+class BoundedIntegerArgument(CommandArgument):
+    def __init__(self, arg_name: str, default: int, maximum: int, help_text: str, strict=False):
+        self.arg_name = arg_name
+        self.default = default
+        self.maximum = maximum
+        self.help_text = help_text
+        self.strict = strict
+        self.values = [str(num) for num in range(1, maximum + 1)]
+
+    def get_flag_values(self, user_input, start_position) -> Generator:
+        value = getattr(user_input, self.arg_name) or ""
+        for completion in [num for num in self.values if num.startswith(value)]:
+            yield Completion(completion, start_position=start_position)
+
+    def setup_parser(self, parser: CliArgumentParser):
+        parser.add_flag_argument(flag_arg_name(self.arg_name), type=str, required=False, help=self.help_text)
+
+    def get_mandatory_arguments(self):
+        return []
+
+    def get_optional_arguments(self):
+        return [flag_arg_name(self.arg_name)]
+
+    def arg_is_multi_word(self, arg_name: str):
+        return False
+
+    def get_keywords(self, user_input):
+        value = getattr(user_input, self.arg_name)
+        if self.strict and value and not (value.isdigit() and 1 <= int(value) <= self.maximum):
+            raise argparse.ArgumentError(None, f"{flag_arg_name(self.arg_name)} expects a number from 1 to {self.maximum}, got {value}")
+
+        return {self.arg_name: int(value) if value and 1 <= int(value) <= self.maximum else self.default}
+
+    def supports_flag_argument_completion(self, arg_name: str):
+        return arg_name == flag_arg_name(self.arg_name)
+
+
+class ParallelArgument(BoundedIntegerArgument):
+    def __init__(self):
+        super().__init__(str(ArgumentNames.PARALLEL.value), 8, 16, "Maximum number of concurrent requests")
+
+
+class TopArgument(BoundedIntegerArgument):
+    def __init__(self, default=25, maximum=200, help_text="Number of hotspots to query"):
+        super().__init__(str(ArgumentNames.TOP.value), default, maximum, help_text)
+
+
+class LimitArgument(BoundedIntegerArgument):
+    def __init__(self):
+        super().__init__(str(ArgumentNames.LIMIT.value), None, 1000, "Show only the N most recent observations", strict=True)
+
+
+class TargetsArgument(CommandArgument):
+    targets_arg = str(ArgumentNames.TARGETS.value)
+    target_lists = [target_list.value for target_list in TargetLists]
+
+    def __init__(self, default: TargetLists | None, help_text: str):
+        self.default = default
+        self.help_text = help_text
+
+    def get_flag_values(self, user_input, start_position) -> Generator:
+        value = user_input.targets or ""
+        for completion in [target_list for target_list in self.target_lists if target_list.startswith(value)]:
+            yield Completion(completion, start_position=start_position)
+
+    def setup_parser(self, parser: CliArgumentParser):
+        parser.add_flag_argument(flag_arg_name(self.targets_arg), type=str, required=False, help=self.help_text)
+
+    def get_mandatory_arguments(self):
+        return []
+
+    def get_optional_arguments(self):
+        return [flag_arg_name(self.targets_arg)]
+
+    def arg_is_multi_word(self, arg_name: str):
+        return False
+
+    def get_keywords(self, user_input):
+        if not user_input.targets:
+            return {self.targets_arg: self.default}
+        if user_input.targets not in self.target_lists:
+            raise argparse.ArgumentError(None, f"{flag_arg_name(self.targets_arg)} expects one of {', '.join(self.target_lists)}, got {user_input.targets}")
+
+        return {self.targets_arg: TargetLists(user_input.targets)}
+
+    def supports_flag_argument_completion(self, arg_name: str):
+        return arg_name == flag_arg_name(self.targets_arg)
+
+
+class ResultArgument(BoundedIntegerArgument):
+    def __init__(self):
+        super().__init__(str(ArgumentNames.RESULT.value), 1, ObservationService.RESULT_HISTORY, "Result set to refine, 1 being the latest", strict=True)
+
+
+class ResultSearchArgument(CommandArgument):
+    result_arg = str(ArgumentNames.RESULT.value)
+
+    def __init__(self, arg_name: str, column: BatchColumns, help_text: str, observation_service: ObservationService):
+        self.arg_name = arg_name
+        self.column = column
+        self.help_text = help_text
+        self.observation_service = observation_service
+
+    def get_flag_values(self, user_input, start_position) -> Generator:
+        number = getattr(user_input, self.result_arg)
+        result = self.observation_service.get_result(int(number) if number and number.isdigit() else 1)
+        if result is None:
+            return
+
+        _, observations = result
+        value = (getattr(user_input, self.arg_name) or "").lower()
+        for completion in sorted(item for item in observations.distinct_values(self.column) if value in item.lower()):
+            yield Completion(completion, start_position=start_position)
+
+    def setup_parser(self, parser: CliArgumentParser):
+        parser.add_flag_argument(flag_arg_name(self.arg_name), type=str, required=False, help=self.help_text)
+
+    def get_mandatory_arguments(self):
+        return []
+
+    def get_optional_arguments(self):
+        return [flag_arg_name(self.arg_name)]
+
+    def arg_is_multi_word(self, arg_name: str):
+        return arg_name == flag_arg_name(self.arg_name)
+
+    def get_keywords(self, user_input):
+        return {self.arg_name: getattr(user_input, self.arg_name)}
+
+    def supports_flag_argument_completion(self, arg_name: str):
+        return arg_name == flag_arg_name(self.arg_name)
+
+
+class SortArgument(CommandArgument):
+    sort_arg = str(ArgumentNames.SORT.value)
+    sorts = ["date", "location", "species"]
+
+    def get_flag_values(self, user_input, start_position) -> Generator:
+        value = user_input.sort or ""
+        for completion in [sort for sort in self.sorts if sort.startswith(value)]:
+            yield Completion(completion, start_position=start_position)
+
+    def setup_parser(self, parser: CliArgumentParser):
+        parser.add_flag_argument(flag_arg_name(self.sort_arg), type=str, required=False, help="Sort by date, location or species (default: date)")
+
+    def get_mandatory_arguments(self):
+        return []
+
+    def get_optional_arguments(self):
+        return [flag_arg_name(self.sort_arg)]
+
+    def arg_is_multi_word(self, arg_name: str):
+        return False
+
+    def get_keywords(self, user_input):
+        if not user_input.sort:
+            return {self.sort_arg: self.sorts[0]}
+        if user_input.sort not in self.sorts:
+            raise argparse.ArgumentError(None, f"{flag_arg_name(self.sort_arg)} expects one of {', '.join(self.sorts)}, got {user_input.sort}")
+
+        return {self.sort_arg: user_input.sort}
+
+    def supports_flag_argument_completion(self, arg_name: str):
+        return arg_name == flag_arg_name(self.sort_arg)
+
+
+class DetailsArgument(CommandArgument):
+    details_arg = str(ArgumentNames.DETAILS.value)
+
+    def get_flag_values(self, user_input, start_position) -> Generator:
+        yield from []
+
+    def setup_parser(self, parser: CliArgumentParser):
+        parser.add_switch_argument(flag_arg_name(self.details_arg), help="Fetch the checklist behind each observation")
+
+    def get_mandatory_arguments(self):
+        return []
+
+    def get_optional_arguments(self):
+        return [flag_arg_name(self.details_arg)]
+
+    def arg_is_multi_word(self, arg_name: str):
+        return False
+
+    def get_keywords(self, user_input):
+        return {self.details_arg: user_input.details}
+
+    def supports_flag_argument_completion(self, arg_name: str):
+        return False
+
+
+class ChecklistIdArgument(CommandArgument):
+    id_arg = str(ArgumentNames.ID.value)
+    separators = r"[\s,]+"
+
+    def get_flag_values(self, user_input, start_position) -> Generator:
+        yield from []
+
+    def setup_parser(self, parser: CliArgumentParser):
+        parser.add_flag_argument(flag_arg_name(self.id_arg), type=str, required=True, help="Checklist submission ids, e.g. S123456789")
+
+    def get_mandatory_arguments(self):
+        return [flag_arg_name(self.id_arg)]
+
+    def get_optional_arguments(self):
+        return []
+
+    def arg_is_multi_word(self, arg_name: str):
+        return arg_name == flag_arg_name(self.id_arg)
+
+    def get_keywords(self, user_input):
+        return {self.id_arg: [sub_id for sub_id in re.split(self.separators, user_input.id) if sub_id]}
+
+    def supports_flag_argument_completion(self, arg_name: str):
+        return False
+
+
+class DateArgument(CommandArgument):
+    def __init__(self, arg_name: str, required: bool, help_text: str):
+        self.arg_name = arg_name
+        self.required = required
+        self.help_text = help_text
+
+    def get_flag_values(self, user_input, start_position) -> Generator:
+        value = getattr(user_input, self.arg_name) or ""
+        today = date.today()
+        for completion in [day.isoformat() for day in (today, today - timedelta(weeks=52)) if day.isoformat().startswith(value)]:
+            yield Completion(completion, start_position=start_position)
+
+    def setup_parser(self, parser: CliArgumentParser):
+        parser.add_flag_argument(flag_arg_name(self.arg_name), type=str, required=self.required, help=self.help_text)
+
+    def get_mandatory_arguments(self):
+        return [flag_arg_name(self.arg_name)] if self.required else []
+
+    def get_optional_arguments(self):
+        return [] if self.required else [flag_arg_name(self.arg_name)]
+
+    def arg_is_multi_word(self, arg_name: str):
+        return False
+
+    def get_keywords(self, user_input):
+        value = getattr(user_input, self.arg_name)
+        if not value:
+            return {self.arg_name: date.today()}
+
+        try:
+            return {self.arg_name: date.fromisoformat(value)}
+        except ValueError:
+            raise argparse.ArgumentError(None, f"{flag_arg_name(self.arg_name)} expects a date as YYYY-MM-DD, got {value}")
+
+    def supports_flag_argument_completion(self, arg_name: str):
+        return arg_name == flag_arg_name(self.arg_name)
@@ -1,13 +1,14 @@
-from typing import List
+from typing import Collection, List
 
 FLAG: str = "-"
+PIPELINE_SEPARATOR: str = ";"
 
 
 def flag_arg_name(arg) -> str:
     return f"{FLAG}{arg}"
 
 
-def preprocess_input(user_input: List[str]):
+def preprocess_input(user_input: List[str], switches: Collection[str] = ()):
     words = []
     temp_word = []
     flag = None
@@ -22,7 +23,11 @@ def preprocess_input(user_input: List[str]):
                 else:
                     words.extend(temp_word)
                 temp_word = []
-            flag = word
+            if word in switches:
+                words.append(word)
+                flag = None
+            else:
+                flag = word
             positional_done = True
         else:
             if positional_done:
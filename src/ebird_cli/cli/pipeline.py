@@ -0,0 +1,55 @@
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+from .command import Command
+from .input_processing import PIPELINE_SEPARATOR
+from ..utils.logger import logger
+
+MAX_WORKERS = 8
+
+
+def split_pipeline(user_input: str) -> List[str]:
+    return [segment.strip() for segment in user_input.split(PIPELINE_SEPARATOR) if segment.strip()]
+
+
+class CommandPipeline:
+    def __init__(self, commands: Dict[str, Command], max_workers=MAX_WORKERS):
+        self.commands = commands
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ebird_cli_pipeline")
+
+    def parse(self, user_input: str) -> List[Tuple[Command | None, Dict[str, any]]]:
+        parsed_segments = []
+
+        for segment in split_pipeline(user_input):
+            command_name, *command_args = segment.split()
+            command = self.commands.get(command_name)
+            parsed_segments.append((command, command.parse_command(*command_args) if command else {}))
+
+        return parsed_segments
+
+    def run(self, user_input: str):
+        parsed_segments = self.parse(user_input)
+        logger.debug(f"pipeline: {len(parsed_segments)} segment(s)")
+
+        futures = [self.executor.submit(command.fetch_result, **kwargs) if command else None for command, kwargs in parsed_segments]
+
+        for (command, _), future in zip(parsed_segments, futures):
+            if command is None:
+                print("Unknown command.")
+                continue
+
+            try:
+                command.render_result(future.result())
+            except Exception as e:
+                logger.exception(f"pipeline segment {command.command_name} failed")
+                print(f"An error occurred: {e}")
+
+    def execute(self, user_input: str):
+        try:
+            self.run(user_input)
+        except argparse.ArgumentError as e:
+            print(f"Invalid argument: {e.message}")
+        except Exception as e:
+            logger.exception("command failed")
+            print(f"An error occurred: {e}")
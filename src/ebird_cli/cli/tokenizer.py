@@ -0,0 +1,172 @@
+import re
+from enum import Enum
+from types import SimpleNamespace
+from typing import Dict, List
+
+from .argument_parser import CliArgumentParser
+from .input_processing import FLAG
+
+TOKEN_PATTERN = re.compile(r"\S+")
+
+
+class TokenKind(Enum):
+    COMMAND = "command"
+    POSITIONAL = "positional"
+    FLAG = "flag"
+    SWITCH = "switch"
+    VALUE = "value"
+    STRAY = "stray"
+
+
+class Token:
+    def __init__(self, text: str, start: int, kind: TokenKind, flag_index: int, flag_ordinal: int, flag_count: int, positional_count: int,
+                 error_count: int):
+        self.text = text
+        self.start = start
+        self.end = start + len(text)
+        self.kind = kind
+        self.flag_index = flag_index
+        self.flag_ordinal = flag_ordinal
+        self.flag_count = flag_count
+        self.positional_count = positional_count
+        self.error_count = error_count
+
+    def is_flag(self) -> bool:
+        return self.kind in (TokenKind.FLAG, TokenKind.SWITCH)
+
+
+def common_prefix_length(previous: str, current: str) -> int:
+    if current.startswith(previous):
+        return len(previous)
+    if previous.startswith(current):
+        return len(current)
+
+    length = 0
+    for previous_char, current_char in zip(previous, current):
+        if previous_char != current_char:
+            break
+        length += 1
+    return length
+
+
+def flag_dest(flag: str) -> str:
+    return flag.lstrip(FLAG)
+
+
+class TokenizedInput:
+    def __init__(self, tokenizer: "IncrementalTokenizer"):
+        text = tokenizer.text
+        tokens = tokenizer.tokens
+        last = tokens[-1] if tokens else None
+        in_word = last is not None and last.end == len(text)
+
+        self.text = text
+        self.current_word = last.text if in_word else ""
+        self.current_start = last.start if in_word else len(text)
+        self.completed_args = max(len(tokens) - 1 - in_word, 0)
+        self.previous = (tokens[-2] if len(tokens) > 1 else None) if in_word else last
+        self.flag_count = last.flag_count if last else 0
+        self.used_flags = {flag for flag, indices in tokenizer.occurrences.items() if indices}
+
+        last_flag = tokens[last.flag_index] if last and last.flag_index >= 0 else None
+        takes_value = last_flag is not None and last_flag.kind == TokenKind.FLAG
+        self.last_flag = last_flag.text if last_flag else None
+        self.current_value = text[last_flag.end + 1:] if takes_value else ""
+        self.current_dest = flag_dest(last_flag.text) if takes_value and last_flag.text in tokenizer.flag_args else None
+
+        self.is_valid = (last is not None and last.error_count == 0 and last.kind != TokenKind.FLAG
+                         and last.positional_count == len(tokenizer.positional_names))
+        self.raw_values = tokenizer.get_raw_values()
+
+    @property
+    def values(self) -> Dict[str, any]:
+        return {dest: " ".join(self.text[value].split()) if isinstance(value, slice) else value for dest, value in self.raw_values.items()}
+
+    @property
+    def namespace(self) -> SimpleNamespace:
+        return SimpleNamespace(**self.values)
+
+    @property
+    def completion_namespace(self) -> SimpleNamespace:
+        values = dict(self.values)
+        if self.current_dest is not None:
+            values[self.current_dest] = self.current_value
+        return SimpleNamespace(**values)
+
+
+class IncrementalTokenizer:
+    def __init__(self, parser: CliArgumentParser):
+        self.positional_names = list(parser.positional_names)
+        self.positional_choices = set(parser.positional_args)
+        self.flag_args = set(parser.flag_args)
+        self.switch_args = set(parser.switch_args)
+        self.text = ""
+        self.tokens: List[Token] = []
+        self.flag_indices: List[int] = []
+        self.occurrences: Dict[str, List[int]] = dict()
+        self.state = TokenizedInput(self)
+
+    def update(self, text: str) -> TokenizedInput:
+        if text == self.text:
+            return self.state
+
+        self.truncate(common_prefix_length(self.text, text))
+        for match in TOKEN_PATTERN.finditer(text, self.tokens[-1].end if self.tokens else 0):
+            self.append(match.group(), match.start())
+
+        self.text = text
+        self.state = TokenizedInput(self)
+        return self.state
+
+    def truncate(self, length: int):
+        while self.tokens and self.tokens[-1].end >= length:
+            token = self.tokens.pop()
+            if token.is_flag():
+                self.flag_indices.pop()
+                self.occurrences[token.text].pop()
+
+    def append(self, text: str, start: int):
+        index = len(self.tokens)
+        previous = self.tokens[-1] if self.tokens else None
+
+        if previous is None:
+            kind, flag_index, error = TokenKind.COMMAND, -1, False
+        elif text.startswith(FLAG):
+            kind = TokenKind.SWITCH if text in self.switch_args else TokenKind.FLAG
+            flag_index = index
+            error = text not in self.flag_args or previous.kind == TokenKind.FLAG
+        elif previous.flag_index < 0:
+            kind, flag_index = TokenKind.POSITIONAL, -1
+            error = previous.positional_count >= len(self.positional_names) or bool(self.positional_choices) and text not in self.positional_choices
+        elif self.tokens[previous.flag_index].kind == TokenKind.SWITCH:
+            kind, flag_index, error = TokenKind.STRAY, previous.flag_index, True
+        else:
+            kind, flag_index, error = TokenKind.VALUE, previous.flag_index, False
+
+        is_flag = kind in (TokenKind.FLAG, TokenKind.SWITCH)
+        token = Token(text, start, kind, flag_index, len(self.flag_indices) if is_flag else -1,
+                      (previous.flag_count if previous else 0) + is_flag,
+                      (previous.positional_count if previous else 0) + (kind == TokenKind.POSITIONAL),
+                      (previous.error_count if previous else 0) + error)
+
+        self.tokens.append(token)
+        if is_flag:
+            self.flag_indices.append(index)
+            self.occurrences.setdefault(text, []).append(index)
+
+    def get_raw_values(self) -> Dict[str, any]:
+        positionals = [token.text for token in self.tokens[1:1 + len(self.positional_names)] if token.kind == TokenKind.POSITIONAL]
+        values = {name: positionals[i] if i < len(positionals) else None for i, name in enumerate(self.positional_names)}
+
+        for flag in self.flag_args:
+            indices = self.occurrences.get(flag)
+            if flag in self.switch_args:
+                values[flag_dest(flag)] = bool(indices)
+            else:
+                values[flag_dest(flag)] = self.get_value_span(self.tokens[indices[-1]]) if indices else None
+
+        return values
+
+    def get_value_span(self, flag: Token) -> slice:
+        next_ordinal = flag.flag_ordinal + 1
+        return slice(flag.end, self.tokens[self.flag_indices[next_ordinal]].start if next_ordinal < len(self.flag_indices) else len(self.text))
@@ -0,0 +1,34 @@
+import argparse
+import shutil
+import socket
+import sys
+
+from .protocol import encode_request, get_socket_path
+
+BUFFER_SIZE = 65536
+
+
+def main():
+    parser = argparse.ArgumentParser(description="eBird CLI client, sends a command to a running `ebird_cli serve` daemon")
+    parser.add_argument("--socket", type=str, default=get_socket_path(), help="Unix socket path used by the daemon")
+    parser.add_argument("command", nargs=argparse.REMAINDER, help="Command to run, e.g. recent hotspot -region Dunes de Tadoussac")
+
+    args = parser.parse_args()
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(args.socket)
+        except (ConnectionRefusedError, FileNotFoundError):
+            print(f"No eBird CLI daemon is listening on {args.socket}, start one with `ebird_cli serve`.", file=sys.stderr)
+            sys.exit(1)
+
+        client.sendall(encode_request(" ".join(args.command), shutil.get_terminal_size().columns))
+        client.shutdown(socket.SHUT_WR)
+
+        while chunk := client.recv(BUFFER_SIZE):
+            sys.stdout.buffer.write(chunk)
+            sys.stdout.buffer.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+import json
+import os
+
+from appdirs import user_cache_dir
+
+SOCKET_NAME = "daemon.sock"
+ENCODING = "utf-8"
+COMMAND_FIELD = "command"
+WIDTH_FIELD = "width"
+
+
+def get_socket_path() -> str:
+    return os.path.join(user_cache_dir("ebird_cli"), SOCKET_NAME)
+
+
+def encode_request(command: str, width: int) -> bytes:
+    return (json.dumps({COMMAND_FIELD: command, WIDTH_FIELD: width}) + "\n").encode(ENCODING)
+
+
+def decode_request(line: bytes) -> dict:
+    return json.loads(line.decode(ENCODING))
@@ -0,0 +1,125 @@
+import io
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+from contextlib import ExitStack, contextmanager
+from typing import Callable
+
+from rich.console import Console
+
+from .protocol import COMMAND_FIELD, ENCODING, WIDTH_FIELD, decode_request
+from ..cli.pipeline import CommandPipeline
+from ..utils.logger import logger
+
+DEFAULT_WIDTH = 120
+
+
+class ThreadLocalStream:
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    @property
+    def target(self):
+        return getattr(self.local, "target", None) or self.stream
+
+    @contextmanager
+    def redirect(self, target):
+        self.local.target = target
+        try:
+            yield
+        finally:
+            self.local.target = None
+
+    def write(self, text):
+        return self.target.write(text)
+
+    def flush(self):
+        self.target.flush()
+
+    def isatty(self):
+        return self.target.isatty()
+
+    def __getattr__(self, name):
+        return getattr(self.target, name)
+
+
+class CommandRequestHandler(socketserver.StreamRequestHandler):
+    server: "CommandServer"
+
+    def handle(self):
+        request = decode_request(self.rfile.readline())
+        user_input = request.get(COMMAND_FIELD, "")
+        logger.debug(f"daemon request: {user_input}")
+
+        output = io.TextIOWrapper(self.wfile, encoding=ENCODING, write_through=True)
+        console = Console(file=output, force_terminal=True, width=request.get(WIDTH_FIELD) or DEFAULT_WIDTH)
+
+        try:
+            with ExitStack() as stack:
+                stack.enter_context(self.server.stdout.redirect(output))
+                for printing_service in self.server.printing_services:
+                    stack.enter_context(printing_service.use_console(console))
+
+                if user_input.split():
+                    self.server.pipeline.execute(user_input)
+                else:
+                    self.server.print_menu()
+        except BrokenPipeError:
+            logger.debug("daemon client disconnected")
+        finally:
+            output.detach()
+
+
+class CommandServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, commands: dict, print_menu: Callable, stdout: ThreadLocalStream):
+        self.pipeline = CommandPipeline(commands)
+        self.printing_services = {command.printing_service for command in commands.values()}
+        self.print_menu = print_menu
+        self.stdout = stdout
+
+        previous_umask = os.umask(0o177)
+        try:
+            super().__init__(socket_path, CommandRequestHandler)
+        finally:
+            os.umask(previous_umask)
+
+
+def is_listening(socket_path: str) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(socket_path)
+            return True
+        except (ConnectionRefusedError, FileNotFoundError):
+            return False
+
+
+def serve(commands: dict, socket_path: str, print_menu: Callable):
+    if os.path.exists(socket_path):
+        if is_listening(socket_path):
+            print(f"An eBird CLI daemon is already listening on {socket_path}")
+            return
+        os.unlink(socket_path)
+
+    os.makedirs(os.path.dirname(socket_path), exist_ok=True)
+
+    stdout = ThreadLocalStream(sys.stdout)
+    sys.stdout = stdout
+
+    server = CommandServer(socket_path, commands, print_menu, stdout)
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    print(f"eBird CLI daemon listening on {socket_path}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Stopping eBird CLI daemon.")
+    finally:
+        server.server_close()
+        os.unlink(socket_path)
+        sys.stdout = stdout.stream
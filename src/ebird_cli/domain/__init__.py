@@ -1,3 +1,4 @@
 from .observation import Observation
+from .observation_batch import ObservationBatch
 
-__all__ = ["Observation"]
+__all__ = ["Observation", "ObservationBatch"]
@@ -6,11 +6,20 @@ class EbirdFields(StrEnum):
     location_name = "locName"
     location_id = "locId"
     common_name = "comName"
+    species_code = "speciesCode"
+    submission_id = "subId"
+    observer_name = "userDisplayName"
+    observations = "obs"
+    count = "howManyStr"
+    comments = "comments"
+    species_count = "numSpecies"
     country_code = "countryCode"
     subnational_name = "subnational1Name"
     subnational_code = "subnational1Code"
     sub_subnational_name = "subnational2Name"
     sub_subnational_code = "subnational2Code"
+    latest_observation_date = "latestObsDt"
+    species_count_all_time = "numSpeciesAllTime"
     name = "name"
     code = "code"
 
@@ -1,10 +1,31 @@
+from datetime import date
+
 import pandas
+from ..domain.fields import EbirdFields
 from ..domain.region import Region
 
+ACTIVITY = "activity"
+ACTIVITY_HALF_LIFE_DAYS = 30
+
+
+def get_activity(hotspots: pandas.DataFrame, today: date) -> pandas.Series:
+    if EbirdFields.latest_observation_date not in hotspots.columns or EbirdFields.species_count_all_time not in hotspots.columns:
+        return pandas.Series(0.0, index=hotspots.index)
+
+    species_count = pandas.to_numeric(hotspots[EbirdFields.species_count_all_time], errors="coerce")
+    latest_observation = pandas.to_datetime(hotspots[EbirdFields.latest_observation_date], errors="coerce")
+    days_since = (pandas.Timestamp(today) - latest_observation).dt.days.clip(lower=0)
+
+    return (species_count * 0.5 ** (days_since / ACTIVITY_HALF_LIFE_DAYS)).fillna(0.0)
+
 
 class LocationCache:
     def __init__(self, region: Region, subnationals: str, subregionals: str, hotspots: str):
         self.subnationals: pandas.DataFrame = pandas.read_csv(subnationals)
         self.subregionals: pandas.DataFrame = pandas.read_csv(subregionals)
-        self.hotspots: pandas.DataFrame = pandas.read_csv(hotspots)
+        self.hotspots: pandas.DataFrame = self.rank_hotspots(pandas.read_csv(hotspots))
         self.region = region
+
+    def rank_hotspots(self, hotspots: pandas.DataFrame) -> pandas.DataFrame:
+        hotspots[ACTIVITY] = get_activity(hotspots, date.today())
+        return hotspots.sort_values(ACTIVITY, ascending=False, kind="stable", ignore_index=True)
@@ -1,4 +1,6 @@
 from datetime import datetime
+from functools import lru_cache
+from typing import Callable, Hashable, Iterable, Iterator
 from .fields import EbirdFields
 import re
 
@@ -8,6 +10,16 @@ datetime_format = "%Y-%m-%d %H:%M"
 date_format = "%Y-%m-%d"
 
 
+@lru_cache(maxsize=4096)
+def clean_location(location_name: str) -> str:
+    return re.sub(regex_filter, "", location_name).split(",")[0][0:55]
+
+
+@lru_cache(maxsize=4096)
+def clean_name(common_name: str) -> str:
+    return re.sub(regex_filter, "", common_name)
+
+
 class Observation(object):
     def __init__(self, observation):
         self.observation_date = observation[EbirdFields.observation_date][0:10]
@@ -15,6 +27,15 @@ class Observation(object):
             self.observation_datetime = datetime.strptime(observation[EbirdFields.observation_date], datetime_format)
         else:
             self.observation_datetime = datetime.strptime(observation[EbirdFields.observation_date], date_format)
-        self.location = re.sub(regex_filter, "", observation[EbirdFields.location_name]).split(",")[0][0:55]
-        self.name = re.sub(regex_filter, "", observation[EbirdFields.common_name])
+        self.location = clean_location(observation[EbirdFields.location_name])
+        self.name = clean_name(observation[EbirdFields.common_name])
         self.subname = observation[EbirdFields.sub_subnational_name] if EbirdFields.sub_subnational_name in observation.keys() else ""
+
+
+def unique_by(items: Iterable, key: Callable[[any], Hashable]) -> Iterator:
+    seen = set()
+    for item in items:
+        item_key = key(item)
+        if item_key not in seen:
+            seen.add(item_key)
+            yield item
@@ -0,0 +1,150 @@
+from enum import StrEnum
+from typing import Callable, Dict, Iterable, List
+
+import numpy
+
+from .fields import EbirdFields
+from .observation import clean_location, clean_name
+
+
+class BatchColumns(StrEnum):
+    name = EbirdFields.common_name
+    location = EbirdFields.location_name
+    subname = EbirdFields.sub_subnational_name
+    submission_id = EbirdFields.submission_id
+    species_code = EbirdFields.species_code
+    location_id = EbirdFields.location_id
+    subcode = EbirdFields.sub_subnational_code
+
+
+COLUMN_TRANSFORMS: Dict[BatchColumns, Callable[[str], str]] = {
+    BatchColumns.name: clean_name,
+    BatchColumns.location: clean_location,
+}
+
+
+class StringTable:
+    def __init__(self, transform: Callable[[str], str] = None):
+        self.transform = transform
+        self.values: List[str] = []
+        self.codes: Dict[str, int] = dict()
+        self.raw_codes: Dict[str, int] = dict()
+
+    def intern(self, raw_value: str) -> int:
+        code = self.raw_codes.get(raw_value)
+        if code is None:
+            value = self.transform(raw_value) if self.transform else raw_value
+            code = self.codes.setdefault(value, len(self.values))
+            if code == len(self.values):
+                self.values.append(value)
+            self.raw_codes[raw_value] = code
+        return code
+
+    def lookup(self, codes: numpy.ndarray) -> list:
+        return [self.values[code] for code in codes.tolist()]
+
+    def mask(self, predicate: Callable[[str], bool]) -> numpy.ndarray:
+        return numpy.fromiter((predicate(value) for value in self.values), dtype=bool, count=len(self.values))
+
+
+class ObservationBatch:
+    def __init__(self, datetimes: numpy.ndarray, columns: Dict[BatchColumns, numpy.ndarray], tables: Dict[BatchColumns, StringTable]):
+        self.datetimes = datetimes
+        self.columns = columns
+        self.tables = tables
+
+    @classmethod
+    def from_results(cls, results: Iterable[dict]) -> "ObservationBatch":
+        tables = {column: StringTable(COLUMN_TRANSFORMS.get(column)) for column in BatchColumns}
+        codes = {column: [] for column in BatchColumns}
+
+        fields = [(str(column), tables[column].intern, codes[column].append) for column in BatchColumns]
+        date_field = str(EbirdFields.observation_date)
+
+        dates = []
+        for result in results:
+            dates.append(result[date_field])
+            for field, intern, append in fields:
+                append(intern(result.get(field, "")))
+
+        return cls(numpy.array(dates, dtype="datetime64[m]").astype("datetime64[s]").astype(numpy.int64),
+                   {column: numpy.array(values, dtype=numpy.int32) for column, values in codes.items()},
+                   tables)
+
+    @property
+    def names(self) -> numpy.ndarray:
+        return self.columns[BatchColumns.name]
+
+    @property
+    def locations(self) -> numpy.ndarray:
+        return self.columns[BatchColumns.location]
+
+    @property
+    def location_ids(self) -> numpy.ndarray:
+        return self.columns[BatchColumns.location_id]
+
+    def __len__(self):
+        return len(self.datetimes)
+
+    def take(self, indices: numpy.ndarray) -> "ObservationBatch":
+        return ObservationBatch(self.datetimes[indices], {column: codes[indices] for column, codes in self.columns.items()}, self.tables)
+
+    def filter(self, mask: numpy.ndarray) -> "ObservationBatch":
+        return self.take(numpy.flatnonzero(mask))
+
+    def sorted_by_datetime(self) -> "ObservationBatch":
+        return self.take(numpy.argsort(self.datetimes, kind="stable"))
+
+    def sorted_by(self, column: BatchColumns) -> "ObservationBatch":
+        table_values = self.tables[column].values
+        ranks = numpy.empty(len(table_values), dtype=numpy.int64)
+        ranks[sorted(range(len(table_values)), key=lambda code: table_values[code].casefold())] = numpy.arange(len(table_values))
+        return self.take(numpy.lexsort((self.datetimes, ranks[self.columns[column]])))
+
+    def unique_by_location_name(self) -> "ObservationBatch":
+        keys = self.locations.astype(numpy.int64) * max(len(self.tables[BatchColumns.name].values), 1) + self.names
+        _, first_indices = numpy.unique(keys, return_index=True)
+        return self.take(numpy.sort(first_indices))
+
+    def latest_by_name(self) -> "ObservationBatch":
+        if not len(self):
+            return self
+
+        order = numpy.lexsort((numpy.arange(len(self)), -self.datetimes, self.names))
+        sorted_names = self.names[order]
+        group_starts = numpy.concatenate(([True], sorted_names[1:] != sorted_names[:-1]))
+        return self.take(order[group_starts])
+
+    def name_mask(self, names: set) -> numpy.ndarray:
+        return self.tables[BatchColumns.name].mask(lambda name: name in names)[self.names]
+
+    def search_mask(self, column: BatchColumns, value: str) -> numpy.ndarray:
+        value = value.lower()
+        return self.tables[column].mask(lambda table_value: value in table_value.lower())[self.columns[column]]
+
+    def count_distinct_names(self, mask: numpy.ndarray) -> int:
+        return len(numpy.unique(self.names[mask]))
+
+    def observation_dates(self) -> list:
+        return numpy.datetime_as_string(self.datetimes.astype("datetime64[s]"), unit="D").tolist()
+
+    def values(self, column: BatchColumns) -> list:
+        return self.tables[column].lookup(self.columns[column])
+
+    def distinct_values(self, column: BatchColumns) -> list:
+        return self.tables[column].lookup(numpy.unique(self.columns[column]))
+
+    def name_values(self) -> list:
+        return self.values(BatchColumns.name)
+
+    def location_values(self) -> list:
+        return self.values(BatchColumns.location)
+
+    def subname_values(self) -> list:
+        return self.values(BatchColumns.subname)
+
+    def submission_id_values(self) -> list:
+        return self.values(BatchColumns.submission_id)
+
+    def species_code_values(self) -> list:
+        return self.values(BatchColumns.species_code)
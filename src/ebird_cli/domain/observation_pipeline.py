@@ -0,0 +1,50 @@
+import heapq
+from operator import itemgetter
+from typing import Callable, Dict, Hashable, Iterable, Iterator, List, Tuple
+
+from .fields import EbirdFields
+from .observation import clean_location, clean_name
+
+observation_date = itemgetter(EbirdFields.observation_date)
+
+
+def name_key(result: dict) -> Hashable:
+    return clean_name(result[EbirdFields.common_name])
+
+
+def location_name_key(result: dict) -> Hashable:
+    return clean_location(result.get(EbirdFields.location_name, "")), clean_name(result[EbirdFields.common_name])
+
+
+def valid_rows(results: Iterable[dict]) -> Iterator[dict]:
+    return (result for result in results if result.get(EbirdFields.observation_date) and result.get(EbirdFields.common_name))
+
+
+def most_recent_rows(results: Iterable[dict], key: Callable[[dict], Hashable], limit: int) -> List[dict]:
+    latest: Dict[Hashable, Tuple[int, dict]] = dict()
+    heap = []
+
+    for sequence, result in enumerate(results):
+        if len(latest) >= limit and observation_date(result) < heap[0][0]:
+            continue
+
+        row_key = key(result)
+        current = latest.get(row_key)
+        if current is not None and observation_date(result) <= observation_date(current[1]):
+            continue
+
+        if current is None and len(latest) >= limit:
+            while latest.get(heap[0][2], (None,))[0] != heap[0][1]:
+                heapq.heappop(heap)
+            if (observation_date(result), sequence) <= heap[0][:2]:
+                continue
+            del latest[heapq.heappop(heap)[2]]
+
+        latest[row_key] = sequence, result
+        heapq.heappush(heap, (observation_date(result), sequence, row_key))
+
+        if len(heap) > 4 * limit:
+            heap = [(observation_date(row), row_sequence, row_key) for row_key, (row_sequence, row) in latest.items()]
+            heapq.heapify(heap)
+
+    return [result for _, result in latest.values()]
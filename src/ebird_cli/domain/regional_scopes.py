@@ -6,4 +6,4 @@ class RegionalScopes(Enum):
     NEARBY = "nearby"
     REGIONAL = "regional"
     SUBNATIONAL = "subnational"
-    # NATIONAL = "national"
+    NATIONAL = "national"
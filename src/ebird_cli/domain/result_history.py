@@ -0,0 +1,19 @@
+import threading
+from collections import deque
+from typing import Tuple
+
+from .observation_batch import ObservationBatch
+
+
+class ResultHistory:
+    def __init__(self, size: int):
+        self.results = deque(maxlen=size)
+        self.lock = threading.Lock()
+
+    def add(self, command_name: str, observations: ObservationBatch):
+        with self.lock:
+            self.results.appendleft((command_name, observations))
+
+    def get(self, number: int) -> Tuple[str, ObservationBatch] | None:
+        with self.lock:
+            return self.results[number - 1] if 1 <= number <= len(self.results) else None
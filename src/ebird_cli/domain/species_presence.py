@@ -0,0 +1,120 @@
+import threading
+from typing import Dict, List, Tuple
+
+import numpy
+
+from .observation_batch import BatchColumns, ObservationBatch, StringTable
+from .target_lists import TargetLists
+
+WORD_BITS = 64
+ONE = numpy.uint64(1)
+ALL_BITS = numpy.uint64(0xFFFFFFFFFFFFFFFF)
+
+
+def species_bits(species: numpy.ndarray) -> Tuple[numpy.ndarray, numpy.ndarray]:
+    return species // WORD_BITS, numpy.left_shift(ONE, (species % WORD_BITS).astype(numpy.uint64))
+
+
+class SpeciesPresence:
+    def __init__(self):
+        self.species = StringTable()
+        self.locations = StringTable()
+        self.regions = StringTable()
+        self.location_names: List[str] = []
+        self.location_regions: List[int] = []
+        self.region_names: List[str] = []
+        self.bits = numpy.zeros((0, 1), dtype=numpy.uint64)
+        self.list_bits: Dict[TargetLists, Tuple[int, numpy.ndarray]] = dict()
+        self.lock = threading.Lock()
+
+    def record(self, observations: ObservationBatch):
+        if not len(observations):
+            return
+
+        with self.lock:
+            species = self.intern_species(observations)[observations.names]
+            locations = self.intern_locations(observations)[observations.location_ids]
+            species_count = len(self.species.values)
+            self.reserve(len(self.locations.values), species_count)
+
+            self.bits[numpy.unique(locations)] = 0
+            rows, species = numpy.divmod(numpy.unique(locations * species_count + species), species_count)
+            words, masks = species_bits(species)
+            numpy.bitwise_or.at(self.bits, (rows, words), masks)
+
+    def intern_species(self, observations: ObservationBatch) -> numpy.ndarray:
+        return numpy.array([self.species.intern(name) for name in observations.tables[BatchColumns.name].values], dtype=numpy.int64)
+
+    def intern_locations(self, observations: ObservationBatch) -> numpy.ndarray:
+        location_codes, first_rows = numpy.unique(observations.location_ids, return_index=True)
+        first_observations = observations.take(first_rows)
+        rows = numpy.zeros(len(observations.tables[BatchColumns.location_id].values), dtype=numpy.int64)
+
+        for location_code, location_id, location_name, region_code, region_name in zip(
+                location_codes.tolist(), first_observations.values(BatchColumns.location_id), first_observations.location_values(),
+                first_observations.values(BatchColumns.subcode), first_observations.subname_values()):
+            region = self.regions.intern(region_code)
+            if region == len(self.region_names):
+                self.region_names.append(region_name)
+
+            row = self.locations.intern(location_id)
+            if row == len(self.location_names):
+                self.location_names.append(location_name)
+                self.location_regions.append(region)
+            rows[location_code] = row
+
+        return rows
+
+    def reserve(self, location_count: int, species_count: int):
+        capacity, words = self.bits.shape
+        needed_words = max(-(-species_count // WORD_BITS), 1)
+        if location_count <= capacity and needed_words <= words:
+            return
+
+        new_capacity = capacity if location_count <= capacity else max(location_count, capacity * 2)
+        new_words = words if needed_words <= words else max(needed_words, words * 2)
+        bits = numpy.zeros((new_capacity, new_words), dtype=numpy.uint64)
+        bits[:capacity, :words] = self.bits
+        self.bits = bits
+
+    def get_list_bits(self, target_list: TargetLists, observed_names: set | None) -> numpy.ndarray:
+        words = self.bits.shape[1]
+        if observed_names is None:
+            return numpy.full(words, ALL_BITS)
+
+        indexed, bits = self.list_bits.get(target_list, (0, numpy.zeros(0, dtype=numpy.uint64)))
+        bits = numpy.concatenate((bits, numpy.zeros(words - len(bits), dtype=numpy.uint64)))
+        observed = numpy.array([code for code, name in enumerate(self.species.values[indexed:], indexed) if name in observed_names], dtype=numpy.int64)
+        observed_words, masks = species_bits(observed)
+        numpy.bitwise_or.at(bits, observed_words, masks)
+
+        self.list_bits[target_list] = len(self.species.values), bits
+        return bits
+
+    def group_by_region(self, bits: numpy.ndarray) -> Tuple[numpy.ndarray, List[str]]:
+        regions = numpy.array(self.location_regions, dtype=numpy.int64)
+        order = numpy.argsort(regions, kind="stable")
+        sorted_regions = regions[order]
+        starts = numpy.flatnonzero(numpy.concatenate(([True], sorted_regions[1:] != sorted_regions[:-1])))
+
+        return numpy.bitwise_or.reduceat(bits[order], starts, axis=0), [self.region_names[region] for region in sorted_regions[starts].tolist()]
+
+    def rank(self, life_names: set | None, year_names: set | None, target_list: TargetLists, by_region: bool, count: int) -> List[tuple]:
+        with self.lock:
+            if not self.location_names:
+                return []
+
+            bits = self.bits[:len(self.location_names)]
+            if by_region:
+                bits, names = self.group_by_region(bits)
+            else:
+                names = self.location_names
+
+            species = numpy.bitwise_count(bits).sum(axis=1, dtype=numpy.int64)
+            life_targets = numpy.bitwise_count(bits & ~self.get_list_bits(TargetLists.LIFE, life_names)).sum(axis=1, dtype=numpy.int64)
+            year_targets = numpy.bitwise_count(bits & ~self.get_list_bits(TargetLists.YEAR, year_names)).sum(axis=1, dtype=numpy.int64)
+
+        targets, other_targets = (life_targets, year_targets) if target_list == TargetLists.LIFE else (year_targets, life_targets)
+        order = numpy.lexsort((-species, -other_targets, -targets))[:count]
+
+        return [(names[index], int(life_targets[index]), int(year_targets[index]), int(species[index])) for index in order.tolist()]
@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class TargetLists(Enum):
+    LIFE = "life"
+    YEAR = "year"
@@ -6,9 +6,12 @@ from .services.cache import CacheService
 from .services.location import LocationService
 from .services.printing import PrintingService
 from .services.observation import ObservationService
+from .services.transport import HttpTransport
 from .domain.region import Region
-from .cli.command import RecentCommand, NotableCommand
+from .cli.command import RecentCommand, NotableCommand, SweepCommand, HistoricCommand, ChecklistCommand, TargetsCommand, RefineCommand
 from .cli.autocomplete import ContextSensitiveCompleter
+from .cli.pipeline import CommandPipeline
+from .daemon.protocol import get_socket_path
 from prompt_toolkit import PromptSession
 from prompt_toolkit.styles import Style
 from prompt_toolkit.key_binding import KeyBindings
@@ -23,7 +26,10 @@ life_list_env_variable = "EBIRDLIFELIST"
 lat_env_variable = "EBIRDLAT"
 long_env_variable = "EBIRDLONG"
 
-region_regex = "([A-Z]{2}-){2}[A-Z]{2}"
+repl_mode = "repl"
+serve_mode = "serve"
+
+region_regex = "[A-Z]{2}-[A-Z0-9]{1,3}(-[A-Z0-9]{1,3})?$"
 
 
 def regex_type(pattern: str | re.Pattern):
@@ -67,6 +73,21 @@ def setup_key_bindings():
 
 
 def setup_parser(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        "mode",
+        nargs="?",
+        choices=[repl_mode, serve_mode],
+        default=repl_mode,
+        help=f"Run the interactive prompt ({repl_mode}) or a resident daemon for ebird_cli_client ({serve_mode})",
+    )
+
+    parser.add_argument(
+        "--socket",
+        type=str,
+        default=get_socket_path(),
+        help="Unix socket path used by the daemon",
+    )
+
     parser.add_argument(
         "--api-key",
         default=os.getenv(api_key_env_variable),
@@ -78,7 +99,7 @@ def setup_parser(parser: argparse.ArgumentParser):
         "--region",
         default=os.getenv(default_region_env_variable),
         required=os.getenv(default_region_env_variable) is None,
-        help="eBird subnational level 2 region code",
+        help="eBird subnational region code, level 1 or 2 (e.g. CA-QC or CA-QC-MR)",
         type=regex_type(region_regex),
     )
 
@@ -118,29 +139,21 @@ def setup_parser(parser: argparse.ArgumentParser):
     )
 
 
-def main():
-    parser = argparse.ArgumentParser(description="eBird CLI")
-    setup_parser(parser)
-
-    args = parser.parse_args()
-
-    api_key = args.api_key
-    region = args.region
-    locale = args.locale
-    lat = args.lat
-    long = args.long
-
+def create_commands(args) -> dict:
     life_list = args.life_list or None
     year_list = args.year_list or None
 
-    cache_service = CacheService(api_key, locale, Region(region))
-    observation_service = ObservationService(api_key, locale, lat, long)
+    transport = HttpTransport()
+    cache_service = CacheService(args.api_key, args.locale, Region(args.region), transport)
+    observation_service = ObservationService(args.api_key, args.locale, args.lat, args.long, transport, cache_responses=args.mode == serve_mode)
     printing_service = PrintingService(life_list, year_list)
     location_service = LocationService(cache_service.location_cache)
 
-    commands = {command.command_name: command for command in
-                [cls(observation_service, location_service, printing_service) for cls in [RecentCommand, NotableCommand]]}
+    return {command.command_name: command for command in
+            [cls(observation_service, location_service, printing_service) for cls in [RecentCommand, NotableCommand, SweepCommand, HistoricCommand, ChecklistCommand, TargetsCommand, RefineCommand]]}
+
 
+def run_prompt(commands: dict):
     style = Style.from_dict({
         'prompt': 'ansigreen bold',
         '': 'ansiwhite',
@@ -148,6 +161,8 @@ def main():
         'completion-menu.completion.current': 'bg:#00aaaa #000000',
     })
 
+    pipeline = CommandPipeline(commands)
+
     print_menu(commands)
     session = PromptSession(completer=ContextSensitiveCompleter(commands.values()), key_bindings=setup_key_bindings())
 
@@ -163,26 +178,33 @@ def main():
                 print_menu(commands)
                 continue
 
-            args = user_input.split()
-            if not args:
+            if not user_input.split():
                 continue
 
-            command_name, *command_args = args
-            user_request = commands.get(command_name)
-
-            if user_request:
-                user_request.handle_command(*command_args)
-            else:
-                print("Unknown command.")
+            pipeline.execute(user_input)
         except KeyboardInterrupt:
             continue
         except EOFError:
             break
-        except argparse.ArgumentError as e:
-            print(f"Invalid argument: {e.message}")
         except Exception as e:
             print(f"An error occurred: {e}")
 
 
+def main():
+    parser = argparse.ArgumentParser(description="eBird CLI")
+    setup_parser(parser)
+
+    args = parser.parse_args()
+
+    commands = create_commands(args)
+
+    if args.mode == serve_mode:
+        # Unix sockets are not available everywhere, keep the prompt usable without them
+        from .daemon.server import serve
+        serve(commands, args.socket, lambda: print_menu(commands))
+    else:
+        run_prompt(commands)
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,118 @@
+from typing import Iterator
+
+from ebird.api.checklists import CHECKLIST_URL
+from ebird.api.hotspots import REGION_HOTSPOTS_URL
+from ebird.api.observations import HISTORIC_OBSERVATIONS_URL, NEARBY_NOTABLE_URL, NEARBY_OBSERVATIONS_URL, \
+    NOTABLE_OBSERVATIONS_URL, OBSERVATIONS_URL
+from ebird.api.regions import REGION_LIST_URL
+from ebird.api.taxonomy import TAXONOMY_URL
+from ebird.api.validation import clean_areas, clean_back, clean_code, clean_detail, clean_dist, clean_hotspot, clean_lat, \
+    clean_lng, clean_locale, clean_max_observations, clean_provisional, clean_region, clean_region_type
+
+from .transport import HttpTransport
+from ..utils.json_stream import iter_json_array
+
+
+class ApiClient:
+    def __init__(self, transport: HttpTransport, api_key: str, locale: str):
+        self.transport = transport
+        self.api_key = api_key
+        self.locale = clean_locale(locale)
+        self.max_observations = None
+        self.back = 14
+        self.detail = 'full'
+        self.hotspot = False
+        self.provisional = True
+
+    def get_headers(self) -> dict:
+        return {'X-eBirdApiToken': self.api_key}
+
+    def get_area_params(self, area) -> tuple:
+        cleaned = clean_areas(area)
+        params = {
+            'back': clean_back(self.back),
+            'maxObservations': clean_max_observations(self.max_observations),
+            'sppLocale': self.locale,
+            'hotspot': clean_hotspot(self.hotspot),
+            'detail': clean_detail(self.detail),
+        }
+
+        if len(cleaned) > 1:
+            params['r'] = ','.join(cleaned)
+
+        return cleaned[0], params
+
+    def get_nearby_params(self, lat, lng, dist) -> dict:
+        return {
+            'lat': clean_lat(lat),
+            'lng': clean_lng(lng),
+            'dist': clean_dist(dist),
+            'back': clean_back(self.back),
+            'maxObservations': clean_max_observations(self.max_observations),
+            'sppLocale': self.locale,
+            'hotspot': clean_hotspot(self.hotspot),
+        }
+
+    def get_observations_request(self, area) -> tuple:
+        area_code, params = self.get_area_params(area)
+        params['includeProvisional'] = clean_provisional(self.provisional)
+        return OBSERVATIONS_URL % area_code, params
+
+    def get_notable_observations_request(self, area) -> tuple:
+        area_code, params = self.get_area_params(area)
+        return NOTABLE_OBSERVATIONS_URL % area_code, params
+
+    def get_observations(self, area) -> list:
+        return self.transport.call(*self.get_observations_request(area), self.get_headers())
+
+    def get_notable_observations(self, area) -> list:
+        return self.transport.call(*self.get_notable_observations_request(area), self.get_headers())
+
+    def stream_observations(self, area) -> Iterator[dict]:
+        return iter_json_array(self.transport.stream(*self.get_observations_request(area), self.get_headers()))
+
+    def stream_notable_observations(self, area) -> Iterator[dict]:
+        return iter_json_array(self.transport.stream(*self.get_notable_observations_request(area), self.get_headers()))
+
+    def get_nearby_observations_request(self, lat, lng, dist) -> tuple:
+        params = self.get_nearby_params(lat, lng, dist)
+        params['includeProvisional'] = clean_provisional(self.provisional)
+        return NEARBY_OBSERVATIONS_URL, params
+
+    def get_nearby_notable_request(self, lat, lng, dist) -> tuple:
+        params = self.get_nearby_params(lat, lng, dist)
+        params['detail'] = clean_detail(self.detail)
+        return NEARBY_NOTABLE_URL, params
+
+    def get_nearby_observations(self, lat, lng, dist=25) -> list:
+        return self.transport.call(*self.get_nearby_observations_request(lat, lng, dist), self.get_headers())
+
+    def get_nearby_notable(self, lat, lng, dist=25) -> list:
+        return self.transport.call(*self.get_nearby_notable_request(lat, lng, dist), self.get_headers())
+
+    def stream_nearby_observations(self, lat, lng, dist=25) -> Iterator[dict]:
+        return iter_json_array(self.transport.stream(*self.get_nearby_observations_request(lat, lng, dist), self.get_headers()))
+
+    def stream_nearby_notable(self, lat, lng, dist=25) -> Iterator[dict]:
+        return iter_json_array(self.transport.stream(*self.get_nearby_notable_request(lat, lng, dist), self.get_headers()))
+
+    def get_historic_observations(self, area, date) -> list:
+        area_code, params = self.get_area_params(area)
+        del params['back']
+        params.update({'rank': 'mrec', 'includeProvisional': clean_provisional(self.provisional)})
+        return self.transport.call(HISTORIC_OBSERVATIONS_URL % (area_code, date.strftime('%Y/%m/%d')), params, self.get_headers())
+
+    def get_hotspots(self, region, back=None) -> list:
+        params = {'fmt': 'json'}
+        if back is not None:
+            params['back'] = clean_back(back)
+        return self.transport.call(REGION_HOTSPOTS_URL % clean_region(region), params, self.get_headers())
+
+    def get_regions(self, rtype, region) -> list:
+        return self.transport.call(REGION_LIST_URL % (clean_region_type(rtype), clean_region(region)), {}, self.get_headers())
+
+    def get_checklist(self, sub_id) -> dict:
+        return self.transport.call(CHECKLIST_URL % clean_code(sub_id), {}, self.get_headers())
+
+    def get_taxonomy(self) -> list:
+        return self.transport.call(TAXONOMY_URL, {'sppLocale': self.locale, 'fmt': 'json'}, self.get_headers())
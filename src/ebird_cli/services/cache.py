@@ -1,9 +1,14 @@
 import csv
+import io
 import os
-from ebird.api import Client
+from typing import Callable
 from appdirs import user_cache_dir
+from .api_client import ApiClient
+from .transport import HttpTransport
 from ..domain.location_cache import LocationCache
 from ..domain.region import Region
+from ..utils.files import file_lock, is_valid, write_checked
+from ..utils.logger import logger
 
 CACHE_DIR = user_cache_dir("ebird_cli")
 LOCATION_DIR = "location"
@@ -12,8 +17,8 @@ os.makedirs(CACHE_DIR, exist_ok=True)
 
 
 class CacheService:
-    def __init__(self, api_key: str, locale: str, region: Region):
-        self.api_client = Client(api_key, locale)
+    def __init__(self, api_key: str, locale: str, region: Region, transport: HttpTransport):
+        self.api_client = ApiClient(transport, api_key, locale)
         self.api_client.detail = 'full'
 
         os.makedirs(CACHE_DIR, exist_ok=True)
@@ -24,22 +29,29 @@ class CacheService:
         subnational_subregions_path = os.path.join(CACHE_DIR, LOCATION_DIR, region.national, region.subnational, "subregions.csv")
         subnational_hotspots_path = os.path.join(CACHE_DIR, LOCATION_DIR, region.national, region.subnational, "hotspots.csv")
 
-        if not os.path.exists(national_subregions_path):
-            subnationals = self.api_client.get_regions('subnational1', region.national)
-            self.write_csv(national_subregions_path, subnationals)
-
-        if not os.path.exists(subnational_subregions_path):
-            subregionals = self.api_client.get_regions('subnational2', region.subnational)
-            hotspots = self.api_client.get_hotspots(region.subnational)
-            self.write_csv(subnational_subregions_path, subregionals)
-            self.write_csv(subnational_hotspots_path, hotspots)
+        self.ensure_csv(national_subregions_path, lambda: self.api_client.get_regions('subnational1', region.national))
+        self.ensure_csv(subnational_subregions_path, lambda: self.api_client.get_regions('subnational2', region.subnational))
+        self.ensure_csv(subnational_hotspots_path, lambda: self.api_client.get_hotspots(region.subnational))
 
         self.location_cache = LocationCache(region, national_subregions_path, subnational_subregions_path, subnational_hotspots_path)
 
+    def ensure_csv(self, file_path, fetch: Callable[[], list]):
+        if is_valid(file_path):
+            return
+
+        with file_lock(file_path):
+            if is_valid(file_path):
+                return
+
+            logger.debug(f"cache miss or corrupt entry, fetching: {file_path}")
+            self.write_csv(file_path, fetch())
+
     def write_csv(self, file_path, data):
-        with open(file_path, mode='w', newline='', encoding='utf-8') as csvfile:
-            fieldnames = data[0].keys()
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames, quoting=csv.QUOTE_MINIMAL)
+        csvfile = io.StringIO(newline='')
+        fieldnames = data[0].keys()
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames, quoting=csv.QUOTE_MINIMAL)
+
+        writer.writeheader()
+        writer.writerows(data)
 
-            writer.writeheader()
-            writer.writerows(data)
+        write_checked(file_path, csvfile.getvalue().encode('utf-8'))
@@ -46,6 +46,12 @@ class LocationService(DataFrameService):
     def get_subnational_id(self, subnational_name):
         return self.get_column(self.search_by(self.location_cache.subnationals, EbirdFields.name, subnational_name), EbirdFields.code)
 
+    def get_nationals(self) -> list:
+        return [self.location_cache.region.national]
+
+    def search_nationals(self, national_code: str) -> list:
+        return [code for code in self.get_nationals() if national_code.lower() in code.lower()]
+
     def get_regions(self) -> list:
         return self.location_cache.subregionals[EbirdFields.name].to_list()
 
@@ -55,12 +61,33 @@ class LocationService(DataFrameService):
     def get_region_id(self, region_name: str) -> list:
         return self.get_column(self.search_by(self.location_cache.subregionals, EbirdFields.name, region_name), EbirdFields.code)
 
+    def get_subregion_ids(self) -> list:
+        subregionals = self.location_cache.subregionals
+        return list(zip(self.get_column(subregionals, EbirdFields.name), self.get_column(subregionals, EbirdFields.code)))
+
+    def get_top_hotspot_ids(self, count: int) -> list:
+        hotspots = self.location_cache.hotspots.head(count)
+        return list(zip(self.get_column(hotspots, EbirdFields.location_name), self.get_column(hotspots, EbirdFields.location_id)))
+
+    def get_active_hotspot_ids(self, region_name: str | None, scope: RegionalScopes, count: int) -> list:
+        hotspots = self.location_cache.hotspots
+        if scope == RegionalScopes.HOTSPOT.value and region_name is not None:
+            hotspots = self.search_by(hotspots, EbirdFields.location_name, region_name)
+        elif scope == RegionalScopes.SUBNATIONAL.value:
+            hotspots = hotspots[hotspots[EbirdFields.subnational_code].isin(self.get_region_ids_by_scope(region_name, scope))]
+        elif scope in (RegionalScopes.REGIONAL.value, RegionalScopes.HOTSPOT.value):
+            hotspots = hotspots[hotspots[EbirdFields.sub_subnational_code].isin(self.get_region_ids_by_scope(region_name, RegionalScopes.REGIONAL.value))]
+        else:
+            return []
+
+        return self.get_column(hotspots.head(count), EbirdFields.location_id)
+
     def get_hotspots(self) -> list:
         return self.location_cache.hotspots[EbirdFields.location_name].to_list() + self.get_favorites()
 
     def get_hotspot_ids(self, hotspot_name: str) -> list:
         hotspots = self.get_by(self.location_cache.hotspots, EbirdFields.location_name, hotspot_name)
-        return self.get_column(hotspots, EbirdFields.location_id) + [value for key, value in self.favorites.items() if hotspot_name == key]
+        return self.get_column(hotspots, EbirdFields.location_id) + [value for key, value in (self.favorites or {}).items() if hotspot_name == key]
 
     def search_hotspots(self, hotspot_name: str) -> list:
         hotspots = self.search_by(self.location_cache.hotspots, EbirdFields.location_name, hotspot_name)
@@ -84,10 +111,14 @@ class LocationService(DataFrameService):
                 regions = self.get_region_id(region_name)
             elif scope == RegionalScopes.HOTSPOT.value:
                 regions = self.get_hotspot_ids(region_name)
+            elif scope == RegionalScopes.NATIONAL.value:
+                regions = [region_name.upper()]
         else:
             regions.append(self.get_default_by_scope(scope))
 
         return regions
 
     def get_default_by_scope(self, scope: RegionalScopes):
+        if scope == RegionalScopes.NATIONAL.value:
+            return self.location_cache.region.national
         return self.location_cache.region.subnational if scope == RegionalScopes.SUBNATIONAL.value else self.location_cache.region.regional
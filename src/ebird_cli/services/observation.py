@@ -1,71 +1,237 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from functools import partial
 from itertools import chain
-
-from ebird.api import Client
-from ..domain import Observation
+from typing import Callable, Iterator
+
+from .api_client import ApiClient
+from .cache import CACHE_DIR
+from .permanent_store import PermanentStore
+from .prefetch import PrefetchService
+from .response_cache import ResponseCache
+from .transport import HttpTransport
+from ..domain import Observation, ObservationBatch
+from ..domain.observation import unique_by
+from ..domain.observation_pipeline import location_name_key, most_recent_rows, name_key, valid_rows
+from ..domain.result_history import ResultHistory
+from ..domain.species_presence import SpeciesPresence
+from ..domain.target_lists import TargetLists
+from ..domain.fields import EbirdFields
+
+STORE_DIR = "store"
+CHECKLISTS_NAMESPACE = "checklists"
+TAXONOMY_NAMESPACE = "taxonomy"
+HISTORIC_NAMESPACE = "historic"
 
 
 class ObservationService:
     DEFAULT_DAYS = 7
-
-    def __init__(self, api_key, locale, lat, long):
-        self.api_client = Client(api_key, locale)
-        self.api_client.detail = 'full'
+    CHECKLIST_WORKERS = 8
+    HISTORIC_WORKERS = 8
+    AREA_WORKERS = 8
+    MAX_AREAS = 10
+    RESULT_HISTORY = 10
+
+    def __init__(self, api_key, locale, lat, long, transport: HttpTransport, cache_responses=False):
+        self.transport = transport
+        self.api_key = api_key
+        self.locale = locale
         self.lat = lat
         self.long = long
+        self.prefetch_service = PrefetchService()
+        self.response_cache = ResponseCache() if cache_responses else None
+        self.store = PermanentStore(os.path.join(CACHE_DIR, STORE_DIR))
+        self.species_names = None
+        self.species_names_lock = threading.Lock()
+        self.species_presence = SpeciesPresence()
+        self.result_history = ResultHistory(self.RESULT_HISTORY)
+
+    def create_client(self, back=DEFAULT_DAYS, hotspot=True) -> ApiClient:
+        api_client = ApiClient(self.transport, self.api_key, self.locale)
+        api_client.detail = 'full'
+        api_client.back = back
+        api_client.hotspot = hotspot
+        return api_client
+
+    def get_location_ids(self, locations: []) -> tuple:
+        return tuple(sorted(set(
+            chain.from_iterable(item if isinstance(item, list) else [item] for item in locations)
+        )))
 
-    def configure_client(self, back, hotspot=True):
-        self.api_client.back = back
-        self.api_client.hotspot = hotspot
+    def fetch_areas(self, fetch: Callable, location_ids: tuple) -> list:
+        chunks = [list(location_ids[i:i + self.MAX_AREAS]) for i in range(0, len(location_ids), self.MAX_AREAS)]
+        if len(chunks) <= 1:
+            return fetch(list(location_ids))
 
-    def get_nearby_notable_observations(self, back=DEFAULT_DAYS) -> list:
-        self.configure_client(back)
+        with ThreadPoolExecutor(max_workers=min(self.AREA_WORKERS, len(chunks)), thread_name_prefix="ebird_cli_areas") as executor:
+            return list(chain.from_iterable(executor.map(fetch, chunks)))
 
-        results = self.api_client.get_nearby_notable(self.lat, self.long, 50)
+    def select_recent_areas(self, stream: Callable, location_ids: tuple, key: Callable, limit: int) -> list:
+        return self.fetch_areas(partial(self.select_recent, stream, key, limit), location_ids)
 
-        return self.get_observations_from_notable(results)
+    def select_recent(self, stream: Callable, key: Callable, limit: int, area: list) -> list:
+        return most_recent_rows(valid_rows(stream(area)), key, limit)
 
-    def get_notable_observations(self, location_id, back=DEFAULT_DAYS) -> list:
-        self.configure_client(back)
+    def request(self, fetch: Callable, *args):
+        key = (fetch.__name__, *args)
+        fetch_response = partial(self.prefetch_service.get, key, partial(fetch, *args))
+        return self.response_cache.get(key, fetch_response) if self.response_cache else fetch_response()
 
-        results = self.api_client.get_notable_observations(location_id)
+    def prefetch(self, fetch: Callable, *args):
+        self.prefetch_service.prefetch((fetch.__name__, *args), partial(fetch, *args))
 
-        return self.get_observations_from_notable(results)
+    def get_nearby_notable_observations(self, back=DEFAULT_DAYS, limit=None) -> ObservationBatch:
+        return self.request(self.fetch_nearby_notable_observations, back, limit)
 
-    def get_observations_from_notable(self, results):
-        notable_observations = list()
-        keys = set()
+    def prefetch_nearby_notable_observations(self, back=DEFAULT_DAYS, limit=None):
+        self.prefetch(self.fetch_nearby_notable_observations, back, limit)
 
-        for result in results:
-            obs = Observation(result)
-            key = f"{obs.location}-{obs.name}"
-            if key not in keys:
-                keys.add(key)
-                notable_observations.append(obs)
+    def fetch_nearby_notable_observations(self, back, limit=None) -> ObservationBatch:
+        api_client = self.create_client(back)
+        if limit is not None:
+            results = api_client.stream_nearby_notable(self.lat, self.long, 50)
+        else:
+            results = api_client.get_nearby_notable(self.lat, self.long, 50)
 
-        return sorted(notable_observations, key=lambda x: x.observation_datetime)
+        return self.get_observations_from_notable(results, limit)
 
-    def get_nearby_recent_observations(self, back=DEFAULT_DAYS) -> list:
-        self.configure_client(back)
+    def get_notable_observations(self, location_id, back=DEFAULT_DAYS, limit=None) -> ObservationBatch:
+        return self.request(self.fetch_notable_observations, self.get_location_ids(location_id), back, limit)
 
-        observations = self.api_client.get_nearby_observations(self.lat, self.long, 50)
+    def prefetch_notable_observations(self, location_id, back=DEFAULT_DAYS, limit=None):
+        self.prefetch(self.fetch_notable_observations, self.get_location_ids(location_id), back, limit)
 
-        return self.get_observations_from_recent(observations)
+    def fetch_notable_observations(self, location_ids: tuple, back, limit=None) -> ObservationBatch:
+        api_client = self.create_client(back)
+        if limit is not None:
+            results = self.select_recent_areas(api_client.stream_notable_observations, location_ids, location_name_key, limit)
+        else:
+            results = self.fetch_areas(api_client.get_notable_observations, location_ids)
 
-    def get_recent_observations(self, locations: [], back=DEFAULT_DAYS) -> list:
-        self.configure_client(back)
+        return self.get_observations_from_notable(results, limit)
 
-        locs = list(set(
-            chain.from_iterable(item if isinstance(item, list) else [item] for item in locations)
-        ))
-        observations = self.api_client.get_observations(locs)
+    def stream_notable_observations(self, locations: [], back=DEFAULT_DAYS, limit=None) -> Iterator[Observation] | ObservationBatch:
+        results = self.create_client(back).stream_notable_observations(list(self.get_location_ids(locations)))
+        if limit is not None:
+            return self.get_observations_from_notable(results, limit)
+
+        return map(Observation, unique_by(results, location_name_key))
+
+    def get_observations_from_notable(self, results, limit=None) -> ObservationBatch:
+        if limit is not None:
+            return ObservationBatch.from_results(most_recent_rows(valid_rows(results), location_name_key, limit)).sorted_by_datetime()
+
+        return ObservationBatch.from_results(results).unique_by_location_name().sorted_by_datetime()
+
+    def get_nearby_recent_observations(self, back=DEFAULT_DAYS, limit=None) -> tuple:
+        return self.request(self.fetch_nearby_recent_observations, back, limit)
+
+    def prefetch_nearby_recent_observations(self, back=DEFAULT_DAYS, limit=None):
+        self.prefetch(self.fetch_nearby_recent_observations, back, limit)
+
+    def fetch_nearby_recent_observations(self, back, limit=None) -> tuple:
+        api_client = self.create_client(back)
+        if limit is not None:
+            return self.get_observations_from_recent(api_client.stream_nearby_observations(self.lat, self.long, 50), limit), None
+
+        return self.get_recent_sightings(api_client.get_nearby_observations(self.lat, self.long, 50))
+
+    def get_recent_observations(self, locations: [], back=DEFAULT_DAYS, limit=None) -> tuple:
+        return self.request(self.fetch_recent_observations, self.get_location_ids(locations), back, limit)
+
+    def prefetch_recent_observations(self, locations: [], back=DEFAULT_DAYS, limit=None):
+        self.prefetch(self.fetch_recent_observations, self.get_location_ids(locations), back, limit)
+
+    def fetch_recent_observations(self, location_ids: tuple, back, limit=None) -> tuple:
+        api_client = self.create_client(back)
+        if limit is not None:
+            observations = self.select_recent_areas(api_client.stream_observations, location_ids, name_key, limit)
+            return self.get_observations_from_recent(observations, limit), None
+
+        return self.get_recent_sightings(self.fetch_areas(api_client.get_observations, location_ids))
+
+    def stream_recent_observations(self, locations: [], back=DEFAULT_DAYS, limit=None) -> Iterator[Observation] | ObservationBatch:
+        observations = self.create_client(back).stream_observations(list(self.get_location_ids(locations)))
+        if limit is not None:
+            return self.get_observations_from_recent(observations, limit)
+
+        return map(Observation, unique_by(observations, name_key))
+
+    def get_recent_sightings(self, observations) -> tuple:
+        sightings = ObservationBatch.from_results(observations)
+        return sightings.latest_by_name().sorted_by_datetime(), sightings
+
+    def get_observations_from_recent(self, observations, limit=None) -> ObservationBatch:
+        if limit is not None:
+            return ObservationBatch.from_results(most_recent_rows(valid_rows(observations), name_key, limit)).sorted_by_datetime()
+
+        return ObservationBatch.from_results(observations).latest_by_name().sorted_by_datetime()
+
+    def record_sightings(self, sightings: ObservationBatch):
+        self.species_presence.record(sightings)
+
+    def record_result(self, command_name: str, observations: ObservationBatch):
+        self.result_history.add(command_name, observations)
+
+    def get_result(self, number: int) -> tuple | None:
+        return self.result_history.get(number)
+
+    def rank_targets(self, life_names: set | None, year_names: set | None, target_list: TargetLists, by_region: bool, count: int) -> list:
+        return self.species_presence.rank(life_names, year_names, target_list, by_region, count)
+
+    def get_historic_observations(self, locations: [], start: date, end: date) -> ObservationBatch:
+        location_ids = self.get_location_ids(locations)
+        days = [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+
+        with ThreadPoolExecutor(max_workers=min(self.HISTORIC_WORKERS, len(days)), thread_name_prefix="ebird_cli_historic") as executor:
+            results = list(executor.map(partial(self.get_historic_day, location_ids), days))
+
+        return self.get_observations_from_recent(chain.from_iterable(results))
+
+    def get_historic_day(self, location_ids: tuple, day: date) -> list:
+        key = f"{self.locale}/{','.join(location_ids)}/{day.isoformat()}"
+        is_complete = day < date.today()
+
+        observations = self.store.get(HISTORIC_NAMESPACE, key) if is_complete else None
+        if observations is None:
+            observations = self.fetch_areas(partial(self.create_client().get_historic_observations, date=day), location_ids)
+            if is_complete:
+                self.store.put(HISTORIC_NAMESPACE, key, observations)
+
+        return observations
+
+    def get_checklists(self, sub_ids: list) -> dict:
+        checklists = dict()
+        missing = []
+
+        for sub_id in dict.fromkeys(sub_id for sub_id in sub_ids if sub_id):
+            checklist = self.store.get(CHECKLISTS_NAMESPACE, sub_id)
+            if checklist is None:
+                missing.append(sub_id)
+            else:
+                checklists[sub_id] = checklist
+
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(self.CHECKLIST_WORKERS, len(missing)), thread_name_prefix="ebird_cli_checklist") as executor:
+                checklists.update(zip(missing, executor.map(self.fetch_checklist, missing)))
+
+        return checklists
+
+    def fetch_checklist(self, sub_id: str) -> dict:
+        checklist = self.create_client().get_checklist(sub_id)
+        self.store.put(CHECKLISTS_NAMESPACE, sub_id, checklist)
+        return checklist
 
-        return self.get_observations_from_recent(observations)
+    def get_species_names(self) -> dict:
+        with self.species_names_lock:
+            if self.species_names is None:
+                self.species_names = self.store.get(TAXONOMY_NAMESPACE, self.locale)
 
-    def get_observations_from_recent(self, observations):
-        unique = dict()
-        for obsJson in observations:
-            obs = Observation(obsJson)
-            if obs.name not in unique.keys() or unique[obs.name].observation_datetime < obs.observation_datetime:
-                unique[obs.name] = obs
+            if self.species_names is None:
+                taxonomy = self.create_client().get_taxonomy()
+                self.species_names = {species[EbirdFields.species_code]: species[EbirdFields.common_name] for species in taxonomy}
+                self.store.put(TAXONOMY_NAMESPACE, self.locale, self.species_names)
 
-        return sorted(unique.values(), key=lambda x: x.observation_datetime)
+        return self.species_names
@@ -0,0 +1,57 @@
+import json
+import os
+from urllib.parse import quote
+
+from ..utils.files import atomic_write, get_checksum
+
+OBJECTS_DIR = "objects"
+REFS_DIR = "refs"
+MAX_REF_NAME = 120
+
+
+class PermanentStore:
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(os.path.join(root, OBJECTS_DIR), exist_ok=True)
+        os.makedirs(os.path.join(root, REFS_DIR), exist_ok=True)
+
+    def get_object_path(self, checksum: str) -> str:
+        return os.path.join(self.root, OBJECTS_DIR, checksum[0:2], f"{checksum}.json")
+
+    def get_ref_path(self, namespace: str, key: str) -> str:
+        ref_name = quote(key, safe="")
+        if len(ref_name) > MAX_REF_NAME:
+            ref_name = get_checksum(key.encode("utf-8"))
+        return os.path.join(self.root, REFS_DIR, namespace, ref_name)
+
+    def read_object(self, checksum: str) -> bytes | None:
+        try:
+            with open(self.get_object_path(checksum), "rb") as object_file:
+                content = object_file.read()
+        except FileNotFoundError:
+            return None
+
+        return content if get_checksum(content) == checksum else None
+
+    def get(self, namespace: str, key: str):
+        try:
+            with open(self.get_ref_path(namespace, key), "r", encoding="ascii") as ref_file:
+                checksum = ref_file.read().strip()
+        except FileNotFoundError:
+            return None
+
+        content = self.read_object(checksum)
+        return json.loads(content) if content is not None else None
+
+    def put(self, namespace: str, key: str, value):
+        content = json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        checksum = get_checksum(content)
+
+        object_path = self.get_object_path(checksum)
+        if self.read_object(checksum) is None:
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            atomic_write(object_path, content)
+
+        ref_path = self.get_ref_path(namespace, key)
+        os.makedirs(os.path.dirname(ref_path), exist_ok=True)
+        atomic_write(ref_path, checksum.encode("ascii"))
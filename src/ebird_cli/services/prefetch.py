@@ -0,0 +1,62 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, Tuple
+
+from ..utils.logger import logger
+
+
+class PrefetchService:
+    DEFAULT_WORKERS = 2
+    DEFAULT_TTL = 60
+
+    def __init__(self, max_workers=DEFAULT_WORKERS, ttl=DEFAULT_TTL):
+        self.max_workers = max_workers
+        self.ttl = ttl
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ebird_cli_prefetch")
+        self.results: Dict[Hashable, Tuple[float, Future]] = dict()
+        self.lock = threading.Lock()
+
+    def prefetch(self, key: Hashable, fetch: Callable):
+        with self.lock:
+            self.evict_expired()
+
+            if key in self.results:
+                return
+
+            self.discard_pending()
+
+            if self.pending_count() >= self.max_workers:
+                return
+
+            logger.debug(f"prefetch: {key}")
+            self.results[key] = (time.monotonic(), self.executor.submit(fetch))
+
+    def get(self, key: Hashable, fetch: Callable):
+        with self.lock:
+            self.evict_expired()
+            entry = self.results.pop(key, None)
+
+        if entry is not None:
+            _, future = entry
+            try:
+                logger.debug(f"prefetch hit: {key}")
+                return future.result()
+            except Exception as e:
+                logger.debug(f"prefetch failed, fetching again: {e}")
+
+        return fetch()
+
+    def discard_pending(self):
+        for key, (_, future) in list(self.results.items()):
+            if future.cancel():
+                del self.results[key]
+
+    def evict_expired(self):
+        now = time.monotonic()
+        for key, (created, future) in list(self.results.items()):
+            if future.done() and now - created > self.ttl:
+                del self.results[key]
+
+    def pending_count(self) -> int:
+        return len([future for _, future in self.results.values() if not future.done()])
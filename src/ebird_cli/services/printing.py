@@ -1,22 +1,55 @@
+import threading
+from contextlib import contextmanager
+from typing import Iterable
+
+import numpy
+
 from .dataframe import DataFrameService
-from ..domain.fields import ExportFields
+from ..domain import Observation, ObservationBatch
+from ..domain.fields import EbirdFields, ExportFields
 from rich.console import Console, Text
 from rich.table import Table
 
 
+STREAM_COLUMN_RATIOS = (4, 5, 3)
+
+
 class PrintingService(DataFrameService):
     def __init__(self, life_list: str or None, year_list: str or None):
-        self.life_list = self.get_dataframe(life_list) if life_list else None
-        self.year_list = self.get_dataframe(year_list) if year_list else None
-        self.console = Console()
+        self.life_list = self.get_names(life_list) if life_list else None
+        self.year_list = self.get_names(year_list) if year_list else None
+        self.default_console = Console()
+        self.local = threading.local()
+
+    @property
+    def console(self) -> Console:
+        return getattr(self.local, "console", None) or self.default_console
+
+    @contextmanager
+    def use_console(self, console: Console):
+        self.local.console = console
+        try:
+            yield
+        finally:
+            self.local.console = None
+
+    def get_names(self, filepath) -> set:
+        return set(self.get_dataframe(filepath)[ExportFields.common_name].to_list())
+
+    def print_notable(self, notable_observations: ObservationBatch | Iterable[Observation]):
+        self.print_observations(notable_observations)
 
-    def print_notable(self, notable_observations: list):
-        self.print_observations(notable_observations, lambda obs: obs.location)
+    def print_recent(self, recent_observations: ObservationBatch | Iterable[Observation]):
+        self.print_observations(recent_observations)
 
-    def print_recent(self, recent_observations: list):
-        self.print_observations(recent_observations, lambda obs: obs.location)
+    def print_historic(self, historic_observations: ObservationBatch):
+        self.print_observations(historic_observations)
+
+    def print_observations(self, observations: ObservationBatch | Iterable[Observation]):
+        if not isinstance(observations, ObservationBatch):
+            self.print_observation_stream(observations)
+            return
 
-    def print_observations(self, observations, location):
         table = Table()
 
         table.add_column('Date', style='magenta')
@@ -24,22 +57,157 @@ class PrintingService(DataFrameService):
         table.add_column('Location')
         table.add_column('Region')
 
+        rows = zip(observations.observation_dates(), observations.name_values(), observations.location_values(), observations.subname_values(),
+                   self.get_life_targets(observations), self.get_year_targets(observations))
+        for observation_date, name, location, subname, is_life_target, is_year_target in rows:
+            table.add_row(observation_date, self.get_observation_text(name, is_life_target, is_year_target), location, subname)
+
+        print()
+        self.console.print(table)
+        print()
+        print(f"Total: {len(observations)}")
+
+    def print_refined(self, command_name: str, source_count: int, observations: ObservationBatch):
+        self.print_observations(observations)
+        print(f"Refined from a {command_name} result of {source_count} observations")
+
+    def print_observation_stream(self, observations: Iterable[Observation]):
+        print()
+        self.console.print(self.get_stream_row(Text('Date', style='bold'), Text('Observation', style='bold'), Text('Location', style='bold'),
+                                               Text('Region', style='bold')))
+
+        total = 0
         for observation in observations:
-            table.add_row(observation.observation_date, self.get_observation_text(observation), location(observation), observation.subname)
+            observation_text = self.get_observation_text(observation.name, self.is_life_target(observation.name), self.is_year_target(observation.name))
+            self.console.print(self.get_stream_row(Text(observation.observation_date, style='magenta'), observation_text, observation.location,
+                                                   observation.subname))
+            total += 1
+
+        print()
+        print(f"Total: {total}")
+
+    def get_stream_row(self, *cells) -> Table:
+        row = Table.grid(padding=(0, 2), expand=True)
+        row.add_column(width=10, no_wrap=True)
+        for ratio in STREAM_COLUMN_RATIOS:
+            row.add_column(ratio=ratio, no_wrap=True, overflow='ellipsis')
+        row.add_row(*cells)
+        return row
+
+    def print_notable_details(self, observations: ObservationBatch, checklists: dict):
+        table = Table()
+
+        table.add_column('Date', style='magenta')
+        table.add_column('Observation')
+        table.add_column('Location')
+        table.add_column('Observer')
+        table.add_column('Count', justify='right')
+        table.add_column('Comments')
+        table.add_column('Checklist', style='cyan')
+
+        checklist_entries = {sub_id: self.get_checklist_entries(checklist) for sub_id, checklist in checklists.items()}
+
+        rows = zip(observations.observation_dates(), observations.name_values(), observations.location_values(),
+                   observations.submission_id_values(), observations.species_code_values(),
+                   self.get_life_targets(observations), self.get_year_targets(observations))
+        for observation_date, name, location, sub_id, species_code, is_life_target, is_year_target in rows:
+            checklist = checklists.get(sub_id, {})
+            entry = checklist_entries.get(sub_id, {}).get(species_code, {})
+            table.add_row(observation_date, self.get_observation_text(name, is_life_target, is_year_target), location,
+                          checklist.get(EbirdFields.observer_name, ""), entry.get(EbirdFields.count, ""), entry.get(EbirdFields.comments, ""), sub_id)
 
         print()
         self.console.print(table)
         print()
         print(f"Total: {len(observations)}")
 
-    def get_observation_text(self, observation):
-        is_year_target = False
-        is_life_target = False
-        if self.year_list is not None:
-            is_year_target = not (self.year_list[ExportFields.common_name] == observation.name).any()
-        if self.life_list is not None:
-            is_life_target = not (self.life_list[ExportFields.common_name] == observation.name).any()
+    def print_checklist(self, checklist: dict, species_names: dict):
+        print()
+        self.console.print(f"[cyan]{checklist.get(EbirdFields.submission_id, '')}[/cyan] [magenta]{checklist.get(EbirdFields.observation_date, '')}[/magenta] "
+                           f"{checklist.get(EbirdFields.observer_name, '')}, {checklist.get(EbirdFields.species_count, 0)} species", highlight=False)
+        if checklist.get(EbirdFields.comments):
+            self.console.print(checklist[EbirdFields.comments], highlight=False)
+
+        table = Table()
 
+        table.add_column('Observation')
+        table.add_column('Count', justify='right')
+        table.add_column('Comments')
+
+        for entry in checklist.get(EbirdFields.observations, []):
+            name = species_names.get(entry.get(EbirdFields.species_code), entry.get(EbirdFields.species_code, ""))
+            table.add_row(self.get_observation_text(name, self.is_life_target(name), self.is_year_target(name)),
+                          entry.get(EbirdFields.count, ""), entry.get(EbirdFields.comments, ""))
+
+        self.console.print(table)
+
+    def get_checklist_entries(self, checklist: dict) -> dict:
+        return {entry.get(EbirdFields.species_code): entry for entry in checklist.get(EbirdFields.observations, [])}
+
+    def print_sweep_progress(self, region_name, observations):
+        life_targets, year_targets = self.count_targets(observations)
+        self.console.print(f"[magenta]{region_name}[/magenta]: {len(observations)} observations, "
+                           f"[red]{life_targets}[/red] life targets, [green]{year_targets}[/green] year targets")
+
+    def print_sweep_failure(self, region_name, error):
+        self.console.print(f"[magenta]{region_name}[/magenta]: [red]failed[/red] ({error})", highlight=False)
+
+    def print_sweep_summary(self, region_observations: list):
+        table = Table()
+
+        table.add_column('Region', style='magenta')
+        table.add_column('Life targets', style='red', justify='right')
+        table.add_column('Year targets', style='green', justify='right')
+        table.add_column('Observations', justify='right')
+
+        rows = [(region_name, *self.count_targets(observations), len(observations)) for region_name, observations in region_observations]
+        for region_name, life_targets, year_targets, total in sorted(rows, key=lambda row: row[1:], reverse=True):
+            table.add_row(region_name, str(life_targets), str(year_targets), str(total))
+
+        print()
+        self.console.print(table)
+
+    def print_targets(self, ranking: list):
+        if not ranking:
+            print()
+            print("No recent observations yet. Run a recent query first.")
+            return
+
+        table = Table()
+
+        table.add_column('Region', style='magenta')
+        table.add_column('Life targets', style='red', justify='right')
+        table.add_column('Year targets', style='green', justify='right')
+        table.add_column('Species', justify='right')
+
+        for region_name, life_targets, year_targets, species in ranking:
+            table.add_row(region_name, str(life_targets), str(year_targets), str(species))
+
+        print()
+        self.console.print(table)
+
+    def count_targets(self, observations: ObservationBatch) -> tuple:
+        return observations.count_distinct_names(self.get_life_targets(observations)), observations.count_distinct_names(self.get_year_targets(observations))
+
+    def get_life_targets(self, observations: ObservationBatch) -> numpy.ndarray:
+        return self.get_targets(observations, self.life_list)
+
+    def get_year_targets(self, observations: ObservationBatch) -> numpy.ndarray:
+        return self.get_targets(observations, self.year_list)
+
+    def get_targets(self, observations: ObservationBatch, observed_names: set | None) -> numpy.ndarray:
+        if observed_names is None:
+            return numpy.zeros(len(observations), dtype=bool)
+
+        return ~observations.name_mask(observed_names)
+
+    def is_life_target(self, name) -> bool:
+        return self.life_list is not None and name not in self.life_list
+
+    def is_year_target(self, name) -> bool:
+        return self.year_list is not None and name not in self.year_list
+
+    def get_observation_text(self, name, is_life_target, is_year_target):
         if is_life_target:
             style = 'red'
         elif is_year_target:
@@ -47,5 +215,4 @@ class PrintingService(DataFrameService):
         else:
             style = 'white'
 
-        return Text(observation.name, style)
-
+        return Text(name, style)
@@ -0,0 +1,40 @@
+import threading
+import time
+from typing import Callable, Dict, Hashable, Tuple
+
+from ..utils.logger import logger
+
+
+class ResponseCache:
+    DEFAULT_TTL = 120
+    DEFAULT_MAX_ENTRIES = 64
+
+    def __init__(self, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries: Dict[Hashable, Tuple[float, any]] = dict()
+        self.lock = threading.Lock()
+
+    def get(self, key: Hashable, fetch: Callable):
+        with self.lock:
+            self.evict_expired()
+            entry = self.entries.get(key)
+
+        if entry is not None:
+            logger.debug(f"response cache hit: {key}")
+            return entry[1]
+
+        response = fetch()
+
+        with self.lock:
+            self.entries[key] = (time.monotonic(), response)
+            while len(self.entries) > self.max_entries:
+                del self.entries[next(iter(self.entries))]
+
+        return response
+
+    def evict_expired(self):
+        now = time.monotonic()
+        for key, (created, _) in list(self.entries.items()):
+            if now - created > self.ttl:
+                del self.entries[key]
@@ -0,0 +1,45 @@
+import json
+from typing import Iterator
+
+import requests
+from ebird.api.utils import filter_parameters, map_parameters
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+
+class HttpTransport:
+    DEFAULT_POOL_SIZE = 16
+    DEFAULT_TIMEOUT = (5, 60)
+    DEFAULT_RETRIES = 2
+    STREAM_CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE, timeout=DEFAULT_TIMEOUT, retries=DEFAULT_RETRIES):
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update({"Accept-Encoding": "gzip, deflate", "User-Agent": "ebird_cli"})
+
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size,
+                              max_retries=Retry(total=retries, backoff_factor=0.2, status_forcelist=[502, 503, 504], allowed_methods=["GET"]))
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def get(self, url, params=None, headers=None, stream=False) -> requests.Response:
+        response = self.session.get(url, params=params, headers=headers, timeout=self.timeout, stream=stream)
+        response.raise_for_status()
+        return response
+
+    def get_response(self, url, params=None, headers=None) -> bytes:
+        return self.get(url, params, headers).content
+
+    def call(self, url, params, headers):
+        return json.loads(self.get_response(url, map_parameters(filter_parameters(params)), headers))
+
+    def stream(self, url, params, headers, chunk_size=STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+        return self.iter_chunks(self.get(url, map_parameters(filter_parameters(params)), headers, stream=True), chunk_size)
+
+    def iter_chunks(self, response: requests.Response, chunk_size) -> Iterator[bytes]:
+        with response:
+            yield from response.iter_content(chunk_size)
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,76 @@
+import hashlib
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+CHECKSUM_EXTENSION = ".sha256"
+LOCK_EXTENSION = ".lock"
+TEMP_SUFFIX = ".tmp"
+
+
+def get_checksum(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def atomic_write(path: str, content: bytes):
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=f".{os.path.basename(path)}.", suffix=TEMP_SUFFIX)
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(content)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+
+def write_checked(path: str, content: bytes):
+    atomic_write(path, content)
+    atomic_write(path + CHECKSUM_EXTENSION, get_checksum(content).encode("ascii"))
+
+
+def read_checked(path: str) -> bytes | None:
+    try:
+        with open(path, "rb") as file:
+            content = file.read()
+        with open(path + CHECKSUM_EXTENSION, "r", encoding="ascii") as file:
+            expected_checksum = file.read().strip()
+    except FileNotFoundError:
+        return None
+
+    return content if get_checksum(content) == expected_checksum else None
+
+
+def is_valid(path: str) -> bool:
+    return read_checked(path) is not None
+
+
+@contextmanager
+def file_lock(path: str):
+    with open(path + LOCK_EXTENSION, "a+b") as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            while True:
+                try:
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
@@ -0,0 +1,56 @@
+import codecs
+import json
+import re
+from enum import Enum
+from typing import Iterable, Iterator
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class ArrayState(Enum):
+    START = "start"
+    FIRST_VALUE = "first_value"
+    VALUE = "value"
+    SEPARATOR = "separator"
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator:
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    position = 0
+    state = ArrayState.START
+
+    for chunk in chunks:
+        buffer = buffer[position:] + text_decoder.decode(chunk)
+        position = 0
+
+        while True:
+            position = WHITESPACE.match(buffer, position).end()
+            if position == len(buffer):
+                break
+
+            char = buffer[position]
+            if state == ArrayState.START:
+                if char != "[":
+                    raise ValueError("expected a JSON array")
+                state = ArrayState.FIRST_VALUE
+                position += 1
+            elif char == "]" and state in (ArrayState.FIRST_VALUE, ArrayState.SEPARATOR):
+                return
+            elif state == ArrayState.SEPARATOR:
+                state = ArrayState.VALUE
+                position += 1
+            else:
+                try:
+                    value, end = decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    break
+                end = WHITESPACE.match(buffer, end).end()
+                if end == len(buffer) or buffer[end] not in ",]":
+                    break
+                yield value
+                state = ArrayState.SEPARATOR
+                position = end
+
+    raise ValueError("invalid or truncated JSON array")
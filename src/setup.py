@@ -8,6 +8,7 @@ setup(
     entry_points={
         'console_scripts': [
             'ebird_cli=ebird_cli.main:main',
+            'ebird_cli_client=ebird_cli.daemon.client:main',
         ],
     },
     author="Kevin Verreault",
@@ -0,0 +1,64 @@
+import statistics
+import sys
+import time
+
+from prompt_toolkit.document import Document
+
+from ebird_cli.cli.autocomplete import ContextSensitiveCompleter
+from ebird_cli.cli.command import ChecklistCommand
+from ebird_cli.cli.input_processing import preprocess_input
+
+TYPED_CHARACTERS = 50
+PIPELINE_PREFIX = "checklist -id S1 ; "
+
+
+def build_line(length: int) -> str:
+    line = "checklist -id"
+    sub_id = 100000000
+    while len(line) < length:
+        line += f" S{sub_id}"
+        sub_id += 1
+    return line
+
+
+def reparse(command, completer, text):
+    command.parser.parse_args(preprocess_input(text.split(" ")[1:], command.parser.switch_args))
+
+
+def complete(command, completer, text):
+    list(completer.get_completions(Document(text), None))
+
+
+def measure(fetch, command, completer, line) -> float:
+    prefix = line[:-TYPED_CHARACTERS]
+    fetch(command, completer, prefix)
+
+    latencies = []
+    for end in range(len(prefix) + 1, len(line) + 1):
+        start = time.perf_counter()
+        fetch(command, completer, line[:end])
+        latencies.append((time.perf_counter() - start) * 1000000)
+    return statistics.mean(latencies)
+
+
+def main():
+    if len(sys.argv) > 2:
+        print("Usage: python benchmark_completion.py [longest line length]")
+        sys.exit(1)
+
+    longest = int(sys.argv[1]) if len(sys.argv) > 1 else 6400
+    command = ChecklistCommand(None, None, None)
+    completer = ContextSensitiveCompleter([command])
+
+    print(f"mean latency per keystroke over the last {TYPED_CHARACTERS} characters typed")
+    length = 100
+    while length <= longest:
+        line = build_line(length)
+        print(f"{len(line):6} chars   argparse re-parse {measure(reparse, command, completer, line):8.1f} µs   "
+              f"incremental completion {measure(complete, command, completer, line):8.1f} µs   "
+              f"in a pipeline {measure(complete, command, completer, PIPELINE_PREFIX + line):8.1f} µs")
+        length *= 4
+
+
+if __name__ == "__main__":
+    main()
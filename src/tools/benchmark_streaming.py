@@ -0,0 +1,95 @@
+import json
+import sys
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from ebird_cli.domain import Observation, ObservationBatch
+from ebird_cli.domain.fields import EbirdFields
+from ebird_cli.domain.observation import clean_name, unique_by
+from ebird_cli.services.transport import HttpTransport
+from ebird_cli.utils.json_stream import iter_json_array
+
+WRITE_SIZE = 64 * 1024
+
+
+def build_payload(records: int) -> bytes:
+    return json.dumps([{"speciesCode": f"sp{i % 1500}", "comName": f"Species {i % 1500} (Group)", "locId": f"L{i}", "locName": f"Hotspot {i}, Country",
+                        "obsDt": "2024-05-01 07:30", "howMany": 1, "subId": f"S{i}", "subnational2Name": f"Region {i % 90}"}
+                       for i in range(records)]).encode("utf-8")
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    payload = b""
+    bytes_per_second = 0
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.payload)))
+        self.end_headers()
+        for start in range(0, len(self.payload), WRITE_SIZE):
+            self.wfile.write(self.payload[start:start + WRITE_SIZE])
+            if self.bytes_per_second:
+                time.sleep(WRITE_SIZE / self.bytes_per_second)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def buffered(transport, url):
+    yield from ObservationBatch.from_results(transport.call(url, {}, {})).latest_by_name().sorted_by_datetime().name_values()
+
+
+def streamed(transport, url):
+    records = iter_json_array(transport.stream(url, {}, {}))
+    for observation in map(Observation, unique_by(records, lambda record: clean_name(record[EbirdFields.common_name]))):
+        yield observation.name
+
+
+def measure(name, fetch, transport, url):
+    start = time.perf_counter()
+    first_row = None
+    rows = 0
+    for _ in fetch(transport, url):
+        if first_row is None:
+            first_row = time.perf_counter() - start
+        rows += 1
+    total = time.perf_counter() - start
+
+    tracemalloc.start()
+    for _ in fetch(transport, url):
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{name:9} first row {first_row * 1000:8.1f} ms   total {total * 1000:8.1f} ms   peak memory {peak / 1024 / 1024:7.1f} MiB   rows {rows}")
+
+
+def main():
+    if len(sys.argv) > 3:
+        print("Usage: python benchmark_streaming.py [records] [simulated bandwidth MB/s]")
+        sys.exit(1)
+
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    StubHandler.bytes_per_second = float(sys.argv[2]) * 1024 * 1024 if len(sys.argv) > 2 else 0
+    StubHandler.payload = build_payload(records)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/ws2.0/data/obs/CA/recent"
+
+    transport = HttpTransport()
+    print(f"{records} records, {len(StubHandler.payload) / 1024 / 1024:.1f} MiB payload")
+    measure("buffered", buffered, transport, url)
+    measure("streamed", streamed, transport, url)
+
+    transport.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import gzip
+import json
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from ebird.api.utils import get_response
+
+from ebird_cli.services.transport import HttpTransport
+
+PAYLOAD = json.dumps([{"comName": f"Species {i}", "locName": "Hotspot", "obsDt": "2024-05-01 07:30"} for i in range(500)]).encode("utf-8")
+GZIP_PAYLOAD = gzip.compress(PAYLOAD)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    connection_setup_seconds = 0.0
+    connections = 0
+
+    def setup(self):
+        super().setup()
+        StubHandler.connections += 1
+        time.sleep(self.connection_setup_seconds)
+
+    def do_GET(self):
+        body = PAYLOAD
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = GZIP_PAYLOAD
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def measure(name, fetch, url, requests_count):
+    StubHandler.connections = 0
+    latencies = []
+    for _ in range(requests_count):
+        start = time.perf_counter()
+        fetch(url)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    print(f"{name:8} mean {statistics.mean(latencies):7.3f} ms   median {statistics.median(latencies):7.3f} ms   "
+          f"p95 {statistics.quantiles(latencies, n=20)[18]:7.3f} ms   connections {StubHandler.connections}")
+
+
+def main():
+    if len(sys.argv) > 3:
+        print("Usage: python benchmark_transport.py [requests] [simulated connection setup ms]")
+        sys.exit(1)
+
+    requests_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    StubHandler.connection_setup_seconds = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.0
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/ws2.0/data/obs/CA-QC/recent"
+
+    transport = HttpTransport()
+    print(f"{requests_count} requests, {len(PAYLOAD)} byte payload ({len(GZIP_PAYLOAD)} gzipped), "
+          f"{StubHandler.connection_setup_seconds * 1000:g} ms simulated connection setup")
+    measure("urlopen", get_response, url, requests_count)
+    measure("pooled", transport.get_response, url, requests_count)
+
+    transport.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()